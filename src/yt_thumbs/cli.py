@@ -2,24 +2,32 @@
 
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
 from .extractor import (
+    download_many,
     download_thumbnail,
     extract_video_id,
+    extract_video_ids,
     get_thumbnail_url,
     get_video_metadata,
 )
 
+# Maximum number of metadata requests in flight during batch processing
+_BATCH_WORKERS = 10
 
-def process_batch_urls(batch_file: str, output_file: str | None = None) -> None:
-    """Process multiple URLs from a file and output as markdown table.
+
+def _read_batch_file(batch_file: str) -> list[str]:
+    """Read non-empty lines from a batch file, exiting on error.
 
     Args:
         batch_file: Path to file containing URLs (one per line)
-        output_file: Optional path to write output (defaults to stdout)
+
+    Returns:
+        The URLs in file order
     """
-    # Read URLs from file
     try:
         with open(batch_file) as f:
             urls = [line.strip() for line in f if line.strip()]
@@ -34,38 +42,108 @@ def process_batch_urls(batch_file: str, output_file: str | None = None) -> None:
         print(f"Error: No URLs found in batch file: {batch_file}", file=sys.stderr)
         sys.exit(1)
 
+    return urls
+
+
+def process_batch_downloads(batch_file: str, output_dir: str | None = None) -> None:
+    """Download thumbnails for multiple URLs from a file.
+
+    Each thumbnail is saved as {video_id}.jpg in the output directory.
+
+    Args:
+        batch_file: Path to file containing URLs (one per line)
+        output_dir: Optional directory to save thumbnails in (defaults to
+            the current directory)
+    """
+    urls = _read_batch_file(batch_file)
+
+    video_ids = []
+    for url, video_id in zip(urls, extract_video_ids(urls), strict=True):
+        if not video_id:
+            print(f"Warning: Skipping invalid URL: {url}", file=sys.stderr)
+            continue
+        video_ids.append(video_id)
+
+    if not video_ids:
+        print("Error: No valid URLs were processed", file=sys.stderr)
+        sys.exit(1)
+
+    directory = Path(output_dir) if output_dir else Path(".")
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        print(f"Error: Could not create output directory: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    # download_many skips duplicate IDs, so no two workers write the same file
+    results = download_many(video_ids, str(directory))
+
+    downloaded_count = 0
+    for video_id, success in results.items():
+        if success:
+            downloaded_count += 1
+            print(f"Downloaded: {directory / f'{video_id}.jpg'}", file=sys.stderr)
+        else:
+            print(
+                f"Warning: Failed to download thumbnail for video ID: {video_id}",
+                file=sys.stderr,
+            )
+
+    if downloaded_count == 0:
+        print("Error: No thumbnails were downloaded", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"\nDownloaded {downloaded_count} of {len(results)} thumbnails", file=sys.stderr)
+
+
+def process_batch_urls(batch_file: str, output_file: str | None = None, fast: bool = False) -> None:
+    """Process multiple URLs from a file and output as markdown table.
+
+    Args:
+        batch_file: Path to file containing URLs (one per line)
+        output_file: Optional path to write output (defaults to stdout)
+        fast: Fetch titles only via oEmbed, leaving descriptions empty
+    """
+    urls = _read_batch_file(batch_file)
+
     # Prepare markdown table
     table_lines = []
     table_lines.append("| Thumbnail URL | Video Name | Video Description |")
     table_lines.append("|---------------|------------|-------------------|")
 
-    # Process each URL
-    processed_count = 0
-    for url in urls:
-        # Extract video ID
-        video_id = extract_video_id(url)
+    # Extract video IDs up front, skipping invalid URLs
+    videos = []
+    for url, video_id in zip(urls, extract_video_ids(urls), strict=True):
         if not video_id:
             print(f"Warning: Skipping invalid URL: {url}", file=sys.stderr)
             continue
+        videos.append((url, video_id))
 
-        # Get metadata
-        try:
-            metadata = get_video_metadata(video_id)
-            thumbnail_url = metadata.get("thumbnail_url", "")
-            title = metadata.get("title", "").replace("|", "\\|")  # Escape pipes
-            description = metadata.get("description", "").replace("|", "\\|")  # Escape pipes
+    # Fetch metadata concurrently; each fetch is dominated by network latency.
+    # Results are collected in input order so the table matches the file.
+    fetch_metadata = partial(get_video_metadata, fast=True) if fast else get_video_metadata
+    processed_count = 0
+    with ThreadPoolExecutor(max_workers=_BATCH_WORKERS) as executor:
+        futures = [(url, executor.submit(fetch_metadata, video_id)) for url, video_id in videos]
 
-            # Truncate description if too long (optional, for readability)
-            if len(description) > 100:
-                description = description[:97] + "..."
+        for url, future in futures:
+            try:
+                metadata = future.result()
+                thumbnail_url = metadata.get("thumbnail_url", "")
+                title = metadata.get("title", "").replace("|", "\\|")  # Escape pipes
+                description = metadata.get("description", "").replace("|", "\\|")  # Escape pipes
 
-            table_lines.append(f"| {thumbnail_url} | {title} | {description} |")
-            processed_count += 1
-            print(f"Processed: {title}", file=sys.stderr)
+                # Truncate description if too long (optional, for readability)
+                if len(description) > 100:
+                    description = description[:97] + "..."
 
-        except Exception as e:
-            print(f"Warning: Error processing {url}: {e}", file=sys.stderr)
-            continue
+                table_lines.append(f"| {thumbnail_url} | {title} | {description} |")
+                processed_count += 1
+                print(f"Processed: {title}", file=sys.stderr)
+
+            except Exception as e:
+                print(f"Warning: Error processing {url}: {e}", file=sys.stderr)
+                continue
 
     if processed_count == 0:
         print("Error: No valid URLs were processed", file=sys.stderr)
@@ -76,10 +154,8 @@ def process_batch_urls(batch_file: str, output_file: str | None = None) -> None:
 
     if output_file:
         try:
-            # Create parent directory if needed
-            output_path = Path(output_file)
-            if output_path.parent != Path("."):
-                output_path.parent.mkdir(parents=True, exist_ok=True)
+            # Create parent directory if needed (no-op if it exists)
+            Path(output_file).parent.mkdir(parents=True, exist_ok=True)
 
             with open(output_file, "w") as f:
                 f.write(output_text)
@@ -98,9 +174,10 @@ def process_batch_urls(batch_file: str, output_file: str | None = None) -> None:
         print(f"\nProcessed {processed_count} of {len(urls)} URLs", file=sys.stderr)
 
 
-def main() -> None:
-    """Main entry point for the CLI."""
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
     parser = argparse.ArgumentParser(
+        prog="yt-thumbs",
         description="Extract and download YouTube video thumbnails",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
@@ -113,16 +190,21 @@ Examples:
   Batch mode:
     %(prog)s --batch urls.txt
     %(prog)s --batch urls.txt --output results.md
+    %(prog)s --batch urls.txt --fast
+    %(prog)s --batch urls.txt --download --output thumbnails/
         """,
     )
 
-    parser.add_argument(
+    # A single URL and a batch file are alternative inputs
+    source = parser.add_mutually_exclusive_group()
+
+    source.add_argument(
         "url",
         nargs="?",  # Make optional
         help="YouTube video URL",
     )
 
-    parser.add_argument(
+    source.add_argument(
         "--batch",
         "-b",
         metavar="FILE",
@@ -133,30 +215,45 @@ Examples:
         "--download",
         "-d",
         action="store_true",
-        help="Download the thumbnail instead of printing the URL (single URL mode only)",
+        help="Download the thumbnail instead of printing the URL",
+    )
+
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Batch mode: fetch titles only, via oEmbed (faster, no descriptions)",
     )
 
     parser.add_argument(
         "--output",
         "-o",
-        help="Output filename (default: {video_id}.jpg in download mode, or stdout in batch mode)",
+        help=(
+            "Output filename (default: {video_id}.jpg in download mode, or stdout in batch "
+            "mode); output directory when combining --batch with --download"
+        ),
     )
 
-    args = parser.parse_args()
+    return parser
+
+
+# Built once at import and reused by every call to main()
+_PARSER = _build_parser()
 
-    # Validate argument combinations
-    if args.batch and args.url:
-        parser.error("Cannot use both URL argument and --batch flag. Choose one mode.")
+
+def main() -> None:
+    """Main entry point for the CLI."""
+    args = _PARSER.parse_args()
 
     if not args.batch and not args.url:
-        parser.error("Either provide a URL or use --batch flag with a file")
+        _PARSER.error("Either provide a URL or use --batch flag with a file")
 
+    # Batch mode
     if args.batch and args.download:
-        parser.error("--download flag is not supported in batch mode")
+        process_batch_downloads(args.batch, args.output)
+        return
 
-    # Batch mode
     if args.batch:
-        process_batch_urls(args.batch, args.output)
+        process_batch_urls(args.batch, args.output, fast=args.fast)
         return
 
     # Extract video ID from URL
@@ -167,6 +264,7 @@ Examples:
         print("  - https://www.youtube.com/watch?v=VIDEO_ID", file=sys.stderr)
         print("  - https://youtu.be/VIDEO_ID", file=sys.stderr)
         print("  - https://www.youtube.com/embed/VIDEO_ID", file=sys.stderr)
+        print("  - https://www.youtube.com/shorts/VIDEO_ID", file=sys.stderr)
         sys.exit(1)
 
     # Get thumbnail URL
@@ -180,11 +278,6 @@ Examples:
     # Download mode
     output_path = args.output if args.output else f"{video_id}.jpg"
 
-    # Create parent directory if it doesn't exist
-    output_file = Path(output_path)
-    if output_file.parent != Path("."):
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-
     print(f"Downloading thumbnail for video ID: {video_id}")
     print(f"Saving to: {output_path}")
 
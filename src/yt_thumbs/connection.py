@@ -0,0 +1,289 @@
+"""Keep-alive HTTP connection pool built on http.client.
+
+urllib.request.urlopen opens a fresh TCP (and TLS) connection for every
+request. Thumbnails are all served from the same host, so keeping
+connections open and reusing them saves a handshake per download in
+batch mode. Host name lookups are cached for a few minutes as well, so
+opening extra connections doesn't wait on the resolver each time.
+"""
+
+import contextlib
+import http.client
+import random
+import socket
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.parse
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+_REDIRECT_CODES = frozenset({301, 302, 303, 307, 308})
+_MAX_REDIRECTS = 5
+
+# Statuses worth another attempt: rate limiting and temporary server trouble.
+# Anything else (404 in particular) is an answer, not a hiccup.
+_RETRY_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Only requests that are safe to send twice are retried
+_RETRY_METHODS = frozenset({"GET", "HEAD"})
+
+# Error bodies up to this size are read off the socket so the connection
+# can be reused; larger ones are dropped together with the connection.
+_DRAIN_LIMIT = 64 * 1024
+
+_PoolKey = tuple[str, str, int | None]
+_Address = tuple[str, int]
+
+
+class ConnectionPool:
+    """Thread-safe pool of persistent HTTP/HTTPS connections, keyed by host.
+
+    Args:
+        maxsize: Maximum number of idle connections kept per host
+        timeout: Socket timeout in seconds for new connections
+        headers: Default headers sent with every request
+        retries: How many times to retry a GET or HEAD that failed with a
+            transient error (timeout, dropped connection, 429 or 5xx)
+        backoff: Base delay in seconds before the first retry; doubles on
+            each further attempt, with random jitter
+        dns_ttl: Seconds to reuse a host name lookup for new connections;
+            0 resolves the name for every connection
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 16,
+        timeout: float = 10,
+        headers: dict[str, str] | None = None,
+        retries: int = 0,
+        backoff: float = 0.3,
+        dns_ttl: float = 300,
+    ) -> None:
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self.retries = retries
+        self.backoff = backoff
+        self.dns_ttl = dns_ttl
+        self._addresses: dict[_Address, tuple[float, list[_Address]]] = {}
+        self._idle: dict[_PoolKey, list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._ssl_context: ssl.SSLContext | None = None
+
+    @contextmanager
+    def request(
+        self, method: str, url: str, headers: dict[str, str] | None = None
+    ) -> Iterator[http.client.HTTPResponse]:
+        """Send a request over a pooled connection.
+
+        Redirects are followed and transient failures are retried (see
+        ``retries``) before the response is handed out. The connection goes
+        back to the pool when the block exits, provided the response body
+        was read to the end.
+
+        Args:
+            method: HTTP method, e.g. "GET" or "HEAD"
+            url: Absolute http:// or https:// URL
+            headers: Optional extra request headers, overriding the defaults
+
+        Yields:
+            The HTTP response
+
+        Raises:
+            urllib.error.HTTPError: If the server answers with a 4xx/5xx status
+            urllib.error.URLError: If the connection or request fails
+        """
+        request_headers = {**self.headers, **(headers or {})}
+        for _ in range(_MAX_REDIRECTS + 1):
+            key, target = _split_url(url)
+            conn, response = self._send_with_retries(key, method, target, request_headers)
+
+            location = response.getheader("Location")
+            if response.status in _REDIRECT_CODES and location:
+                self._release(key, conn, response)
+                url = urllib.parse.urljoin(url, location)
+                if response.status == 303:
+                    method = "GET"
+                continue
+
+            if response.status >= 400:
+                self._release(key, conn, response)
+                raise urllib.error.HTTPError(
+                    url, response.status, response.reason, response.msg, None
+                )
+
+            try:
+                yield response
+            finally:
+                self._release(key, conn, response)
+            return
+
+        raise urllib.error.URLError(f"Too many redirects: {url}")
+
+    def clear(self) -> None:
+        """Close all idle connections and forget cached host name lookups."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+            self._addresses.clear()
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+    def _send_with_retries(
+        self, key: _PoolKey, method: str, target: str, headers: dict[str, str]
+    ) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """Send a request, retrying transient failures with exponential backoff."""
+        retries = self.retries if method in _RETRY_METHODS else 0
+        for attempt in range(retries):
+            try:
+                conn, response = self._send(key, method, target, headers)
+            except urllib.error.URLError as e:
+                if not _is_transient(e):
+                    raise
+            else:
+                if response.status not in _RETRY_CODES:
+                    return conn, response
+                self._release(key, conn, response)
+            time.sleep(self.backoff * 2**attempt * random.uniform(0.5, 1.5))
+
+        # Last attempt: whatever happens is the result
+        return self._send(key, method, target, headers)
+
+    def _send(
+        self, key: _PoolKey, method: str, target: str, headers: dict[str, str]
+    ) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """Send a request, retrying once if a reused connection went stale."""
+        conn, reused = self._acquire(key)
+        if reused:
+            try:
+                conn.request(method, target, headers=headers)
+                return conn, conn.getresponse()
+            except ConnectionError:
+                # The server dropped the idle keep-alive connection
+                conn.close()
+                conn = self._connect(key)
+            except (http.client.HTTPException, OSError) as e:
+                conn.close()
+                raise urllib.error.URLError(e) from e
+
+        try:
+            conn.request(method, target, headers=headers)
+            return conn, conn.getresponse()
+        except (http.client.HTTPException, OSError) as e:
+            conn.close()
+            raise urllib.error.URLError(e) from e
+
+    def _acquire(self, key: _PoolKey) -> tuple[http.client.HTTPConnection, bool]:
+        """Take an idle connection for the host, or open a new one."""
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self._connect(key), False
+
+    def _connect(self, key: _PoolKey) -> http.client.HTTPConnection:
+        """Create a (not yet connected) connection for the host."""
+        scheme, host, port = key
+        conn: http.client.HTTPConnection
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(
+                host, port, timeout=self.timeout, context=self._get_ssl_context()
+            )
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+        if self.dns_ttl > 0:
+            # http.client opens its socket through this hook; the connection
+            # keeps its host name, so the Host header and TLS SNI are unchanged
+            setattr(conn, "_create_connection", self._open_socket)  # noqa: B010
+        return conn
+
+    def _open_socket(
+        self, address: _Address, timeout: float | None, source_address: _Address | None = None
+    ) -> socket.socket:
+        """Connect to a host using cached lookups, trying each address in turn."""
+        error: OSError | None = None
+        for ip_address in self._resolve(address):
+            try:
+                return socket.create_connection(ip_address, timeout, source_address)
+            except OSError as e:
+                error = e
+
+        # The host may have moved; look it up afresh next time
+        with self._lock:
+            self._addresses.pop(address, None)
+        raise error or OSError(f"No addresses found for {address[0]}")
+
+    def _resolve(self, address: _Address) -> list[_Address]:
+        """Return the IP addresses for a host and port, cached for dns_ttl seconds."""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._addresses.get(address)
+            if cached is not None and cached[0] > now:
+                return cached[1]
+
+        # Resolve outside the lock so a slow lookup doesn't block other hosts
+        host, port = address
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        ip_addresses = list(dict.fromkeys((str(info[4][0]), port) for info in infos))
+        with self._lock:
+            self._addresses[address] = (now + self.dns_ttl, ip_addresses)
+        return ip_addresses
+
+    def _get_ssl_context(self) -> ssl.SSLContext:
+        """Return the TLS context shared by all HTTPS connections.
+
+        Building a context loads the CA bundle from disk, so doing it once
+        per pool instead of once per connection matters when a batch opens
+        many connections at the same time.
+        """
+        with self._lock:
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            return self._ssl_context
+
+    def _release(
+        self,
+        key: _PoolKey,
+        conn: http.client.HTTPConnection,
+        response: http.client.HTTPResponse,
+    ) -> None:
+        """Return a connection to the pool, or close it if it can't be reused."""
+        if not response.isclosed() and response.length is not None:
+            if response.length <= _DRAIN_LIMIT:
+                with contextlib.suppress(http.client.HTTPException, OSError):
+                    response.read()
+
+        if not response.isclosed() or response.will_close:
+            conn.close()
+            return
+
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.maxsize:
+                idle.append(conn)
+                return
+        conn.close()
+
+
+def _is_transient(error: urllib.error.URLError) -> bool:
+    """Check whether a failed request might succeed if sent again."""
+    reason = error.reason
+    if isinstance(reason, socket.gaierror):
+        # "Temporary failure in name resolution", not an unknown host
+        return reason.errno == socket.EAI_AGAIN
+    return isinstance(reason, (TimeoutError, ConnectionError, http.client.HTTPException))
+
+
+def _split_url(url: str) -> tuple[_PoolKey, str]:
+    """Split a URL into its pool key and request target."""
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise urllib.error.URLError(f"Unsupported URL: {url}")
+
+    target = parts.path or "/"
+    if parts.query:
+        target += "?" + parts.query
+    return (parts.scheme, parts.hostname, parts.port), target
@@ -4,9 +4,180 @@ This module provides functions to extract video IDs from YouTube URLs,
 generate thumbnail URLs, and download thumbnails.
 """
 
+import contextlib
+import gzip
+import html
+import http.client
+import io
+import json
+import os
 import re
+import shutil
+import threading
+import time
 import urllib.error
-import urllib.request
+import urllib.parse
+import uuid
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Generic, TypeVar
+
+from .connection import ConnectionPool
+
+_T = TypeVar("_T")
+
+# Compiled once at import; extract_video_id runs per URL in batch mode.
+# Matches youtube.com/watch?v=ID, youtube.com/embed/ID, youtube.com/shorts/ID
+# and youtu.be/ID in a single scan.
+_VIDEO_ID_PATTERN = re.compile(
+    r"(?:youtube\.com/(?:watch\?v=|embed/|shorts/)|youtu\.be/)([a-zA-Z0-9_-]{11})"
+)
+
+# Validates an already extracted candidate; used with fullmatch, so anchored
+_VIDEO_ID_CHARS_PATTERN = re.compile(r"[a-zA-Z0-9_-]{11}")
+
+# Meta tags holding the title and description on the watch page. Bytes
+# patterns, so the page is searched without decoding all of it first. The
+# content attribute may be double- or single-quoted (group 1 or 2).
+_TITLE_PATTERN = re.compile(
+    rb"""<meta\s+property=["']og:title["']\s+content=(?:"([^"]*)"|'([^']*)')"""
+)
+_DESCRIPTION_PATTERN = re.compile(
+    rb"""<meta\s+property=["']og:description["']\s+content=(?:"([^"]*)"|'([^']*)')"""
+)
+
+# Base URL for thumbnail images; quality variants live under {video_id}/
+_THUMBNAIL_BASE_URL = "https://img.youtube.com/vi"
+
+# Watch page; its meta tags carry the title and description
+_WATCH_URL = "https://www.youtube.com/watch"
+
+# oEmbed endpoint; returns a small JSON document with the title, but no description
+_OEMBED_URL = "https://www.youtube.com/oembed"
+
+# Environment variable overriding the cache directory; empty disables caching
+_CACHE_ENV_VAR = "YT_THUMBS_CACHE"
+
+# Seconds before a cached metadata entry is refetched; titles and
+# descriptions can be edited, unlike thumbnails at a given quality.
+_METADATA_TTL = 24 * 60 * 60
+
+# Size and lifetime of the in-process metadata cache that sits in front of
+# the on-disk one
+_METADATA_MEMORY_SIZE = 4096
+_METADATA_MEMORY_TTL = 60 * 60
+
+# Default number of thumbnail downloads in flight in download_many
+_DOWNLOAD_WORKERS = 16
+
+# maxresdefault responses this size or smaller are YouTube's placeholder image
+_PLACEHOLDER_SIZE = 1000
+
+# Runs requests that overlap one made by the calling thread: hqdefault probes
+# and metadata fetches. Tasks never wait on each other, so sharing it can't
+# deadlock. Threads are only started on first use, so importing stays cheap.
+_EXECUTOR = ThreadPoolExecutor(max_workers=_DOWNLOAD_WORKERS, thread_name_prefix="yt-thumbs")
+
+# Read size used when streaming thumbnails to disk
+_CHUNK_SIZE = 64 * 1024
+
+_USER_AGENT = "yt-thumbs"
+
+# Shared keep-alive connections, so batch runs against img.youtube.com and
+# www.youtube.com pay for the TCP/TLS handshake once per connection instead
+# of once per request.
+# JPEGs don't compress further, so images are requested uncompressed.
+# Timeouts, dropped connections, 429s and 5xx errors are retried twice.
+_POOL = ConnectionPool(
+    maxsize=16,
+    headers={"User-Agent": _USER_AGENT, "Connection": "keep-alive"},
+    retries=2,
+)
+
+# The watch page HTML compresses well, so ask for it compressed. Brotli would
+# need a third-party decoder, so only the encodings zlib handles are offered.
+_PAGE_HEADERS = {"Accept-Encoding": "gzip, deflate"}
+
+
+def _is_valid_video_id(candidate: str) -> bool:
+    """Check that a string has the shape of a YouTube video ID.
+
+    The length test rejects most bad candidates for free; the anchored
+    regex then checks the character set without scanning for a start
+    position.
+    """
+    return len(candidate) == 11 and _VIDEO_ID_CHARS_PATTERN.fullmatch(candidate) is not None
+
+
+def _check_video_id(video_id: str) -> None:
+    """Raise ValueError unless video_id has the shape of a YouTube video ID.
+
+    IDs become cache and output file names, so anything else (``../x``,
+    say) must be stopped before a path is built from it.
+    """
+    if not _is_valid_video_id(video_id):
+        raise ValueError(f"Invalid YouTube video ID: {video_id!r}")
+
+
+def _id_from_short_link(parts: urllib.parse.SplitResult) -> str:
+    """Return the ID candidate from a youtu.be/ID link."""
+    return parts.path[1:].partition("/")[0]
+
+
+def _id_from_youtube_page(parts: urllib.parse.SplitResult) -> str:
+    """Return the ID candidate from a youtube.com watch, embed or shorts URL."""
+    if parts.path == "/watch":
+        for param in parts.query.split("&"):
+            key, _, value = param.partition("=")
+            if key == "v":
+                return value
+        return ""
+
+    kind, _, rest = parts.path[1:].partition("/")
+    if kind in ("embed", "shorts"):
+        return rest.partition("/")[0]
+    return ""
+
+
+# Maps a host (without "www.") to the function locating the ID in its URLs
+_ID_FINDERS: dict[str, Callable[[urllib.parse.SplitResult], str]] = {
+    "youtu.be": _id_from_short_link,
+    "youtube.com": _id_from_youtube_page,
+    "m.youtube.com": _id_from_youtube_page,
+}
+
+
+def _video_id_from_url_parts(url: str) -> str | None:
+    """Extract a video ID by splitting the URL instead of scanning it.
+
+    Handles well-formed URLs, where the ID sits at a known position: the
+    ``v`` query parameter of ``/watch``, or the path segment after
+    ``youtu.be/``, ``/embed/`` or ``/shorts/``.
+
+    Args:
+        url: The YouTube URL to parse
+
+    Returns:
+        The video ID if found at its expected position, None otherwise
+    """
+    try:
+        parts = urllib.parse.urlsplit(url if "://" in url else "//" + url)
+    except ValueError:
+        return None
+
+    # netloc is almost always a bare host; only parse it further if needed
+    host = parts.netloc
+    if ":" in host or "@" in host:
+        host = parts.hostname or ""
+    find_id = _ID_FINDERS.get(host.lower().removeprefix("www."))
+    if find_id is None:
+        return None
+
+    candidate = find_id(parts)
+    return candidate if _is_valid_video_id(candidate) else None
 
 
 def extract_video_id(url: str) -> str | None:
@@ -16,6 +187,7 @@ def extract_video_id(url: str) -> str | None:
     - https://www.youtube.com/watch?v=VIDEO_ID
     - https://youtu.be/VIDEO_ID
     - https://www.youtube.com/embed/VIDEO_ID
+    - https://www.youtube.com/shorts/VIDEO_ID
 
     Args:
         url: The YouTube URL to parse
@@ -23,83 +195,455 @@ def extract_video_id(url: str) -> str | None:
     Returns:
         The video ID if found, None otherwise
     """
-    # Pattern for youtube.com/watch?v=VIDEO_ID
-    watch_pattern = r"(?:youtube\.com/watch\?v=)([a-zA-Z0-9_-]{11})"
+    # Cheap substring test rejects non-YouTube input without entering the regex engine
+    if "youtu" not in url:
+        return None
+
+    video_id = _video_id_from_url_parts(url)
+    if video_id:
+        return video_id
 
-    # Pattern for youtu.be/VIDEO_ID
-    short_pattern = r"(?:youtu\.be/)([a-zA-Z0-9_-]{11})"
+    # Fall back to scanning for URLs that don't split cleanly
+    match = _VIDEO_ID_PATTERN.search(url)
+    return match.group(1) if match else None
 
-    # Pattern for youtube.com/embed/VIDEO_ID
-    embed_pattern = r"(?:youtube\.com/embed/)([a-zA-Z0-9_-]{11})"
 
-    # Try each pattern
-    for pattern in [watch_pattern, short_pattern, embed_pattern]:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
+def extract_video_ids(urls: Iterable[str]) -> Iterator[str | None]:
+    """Extract video IDs from many YouTube URLs.
 
-    return None
+    Yields lazily, so a large file of URLs can be streamed through without
+    holding the results in memory.
 
+    Args:
+        urls: The YouTube URLs to parse
+
+    Yields:
+        The video ID for each URL in order, or None where none was found
+    """
+    for url in urls:
+        yield extract_video_id(url)
 
-def get_thumbnail_url(video_id: str) -> str:
-    """Get the maxresdefault thumbnail URL for a video ID.
+
+def get_thumbnail_url(video_id: str, quality: str = "maxresdefault") -> str:
+    """Get the thumbnail URL for a video ID.
 
     Args:
         video_id: The YouTube video ID
+        quality: Thumbnail quality name, e.g. "maxresdefault" or "hqdefault"
+
+    Returns:
+        The thumbnail URL (maxresdefault by default)
+    """
+    return f"{_THUMBNAIL_BASE_URL}/{video_id}/{quality}.jpg"
+
+
+def _part_path(path: str | Path) -> str:
+    """Return a fresh temporary file name next to path, ending in ``.part``.
+
+    Each writer gets its own name, so threads or processes writing the same
+    path (two CLI runs sharing the cache, say) never write into one file.
+    """
+    return f"{path}.{uuid.uuid4().hex[:12]}.part"
+
+
+def _stream_to_file(response: io.BufferedIOBase, output_path: str) -> None:
+    """Stream a response body to disk in fixed-size chunks.
+
+    Avoids holding the whole image in memory. Chunks are read with
+    readinto() into one reused buffer, so socket data lands directly in it
+    and no bytes object is allocated per chunk.
+
+    The body is written to a ``.part`` file next to ``output_path`` and
+    moved into place once complete, so ``output_path`` is only ever written
+    once and never holds a partial image. If the transfer fails, the
+    ``.part`` file is removed before the error propagates.
+
+    Args:
+        response: An open HTTP response (any readable binary stream)
+        output_path: Path where the body should be saved
+
+    Raises:
+        http.client.IncompleteRead: If the connection closed before the
+            whole body (per Content-Length) arrived
+    """
+    part_path = _part_path(output_path)
+    buffer = memoryview(bytearray(_CHUNK_SIZE))
+    try:
+        with open(part_path, "xb") as f:
+            while size := response.readinto(buffer):
+                f.write(buffer[:size])
+        # readinto() signals an early EOF by returning 0, not by raising;
+        # an HTTP response still expecting bytes was cut short
+        remaining = getattr(response, "length", None)
+        if isinstance(remaining, int) and remaining > 0:
+            raise http.client.IncompleteRead(b"", remaining)
+        os.replace(part_path, output_path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(part_path)
+        raise
+
+
+def _cache_dir() -> Path | None:
+    """Return the cache directory, or None if caching is disabled.
+
+    Defaults to ~/.cache/yt-thumbs. Set YT_THUMBS_CACHE to use another
+    directory, or to an empty string to turn caching off.
+    """
+    configured = os.environ.get(_CACHE_ENV_VAR)
+    if configured is None:
+        return Path.home() / ".cache" / "yt-thumbs"
+    return Path(configured) if configured else None
+
+
+def _is_cached(cache_path: Path) -> bool:
+    """Check whether a non-empty cache entry exists."""
+    try:
+        return cache_path.stat().st_size > 0
+    except OSError:
+        return False
+
+
+class _MemoryCache:
+    """Thread-safe least-recently-used cache whose entries expire.
+
+    Args:
+        maxsize: Maximum number of entries; the least recently used is
+            evicted first
+        ttl: Seconds an entry stays valid
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[str, bool], tuple[float, dict[str, str]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, bool]) -> dict[str, str] | None:
+        """Return a copy of a live entry, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return dict(entry[1])
+
+    def put(self, key: tuple[str, bool], value: dict[str, str], ttl: float | None = None) -> None:
+        """Store a copy of value, evicting the oldest entry if full.
+
+        A ttl shorter than the cache's own (the remaining lifetime of a
+        disk entry, say) makes the entry expire sooner.
+        """
+        lifetime = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + lifetime, dict(value))
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Recent metadata lookups, keyed by (video_id, fast)
+_METADATA_MEMORY = _MemoryCache(_METADATA_MEMORY_SIZE, _METADATA_MEMORY_TTL)
+
+
+class _SharedCalls(Generic[_T]):
+    """Lets concurrent callers asking for the same key share one call.
+
+    The first caller for a key runs the function; callers arriving while it
+    is still running wait for its result (or exception) instead of repeating
+    the work. Once it finishes, the next caller starts afresh.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[Hashable, Future[_T]] = {}
+        self._lock = threading.Lock()
+
+    def run(self, key: Hashable, fn: Callable[[], _T]) -> _T:
+        """Call fn, or wait for a call already running for key, and return its result."""
+        with self._lock:
+            future = self._in_flight.get(key)
+            shared = future is not None
+            if future is None:
+                future = self._in_flight[key] = Future()
+
+        if shared:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+
+# Network fetches in progress, so simultaneous requests for one video share them
+_METADATA_FETCHES: _SharedCalls[dict[str, str]] = _SharedCalls()
+_THUMBNAIL_FETCHES: _SharedCalls[bool] = _SharedCalls()
+
+
+def _load_cached_metadata(cache_path: Path) -> tuple[dict[str, str], float] | None:
+    """Read a metadata cache entry, or None if it is missing, stale or corrupt.
 
     Returns:
-        The maxresdefault thumbnail URL
+        The entry, and the seconds left before it goes stale
+    """
+    try:
+        remaining = _METADATA_TTL - (time.time() - cache_path.stat().st_mtime)
+        if remaining <= 0:
+            return None
+        with open(cache_path, encoding="utf-8") as f:
+            entry = json.load(f)
+        metadata = {"title": str(entry["title"]), "description": str(entry["description"])}
+        return metadata, remaining
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _store_metadata(cache_path: Path, title: str, description: str) -> None:
+    """Write a metadata cache entry; best effort, failures are ignored."""
+    part_path = _part_path(cache_path)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(part_path, "x", encoding="utf-8") as f:
+            json.dump({"title": title, "description": description}, f, ensure_ascii=False)
+        os.replace(part_path, cache_path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.unlink(part_path)
+
+
+def clear_metadata_cache() -> None:
+    """Remove all cached video metadata, in memory and on disk.
+
+    Cached thumbnails are left alone.
+    """
+    _METADATA_MEMORY.clear()
+    cache_dir = _cache_dir()
+    if cache_dir is not None:
+        shutil.rmtree(cache_dir / "metadata", ignore_errors=True)
+
+
+def clear_thumbnail_cache() -> None:
+    """Remove all cached thumbnails from disk.
+
+    Cached metadata is left alone.
     """
-    return f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
+    cache_dir = _cache_dir()
+    if cache_dir is not None:
+        shutil.rmtree(cache_dir / "thumbnails", ignore_errors=True)
 
 
-def download_thumbnail(video_id: str, output_path: str) -> bool:
+def download_thumbnail(video_id: str, output_path: str, parallel_probes: bool = True) -> bool:
     """Download a YouTube thumbnail to a file.
 
-    Attempts to download the maxresdefault quality thumbnail first.
-    If that returns a 404, falls back to hqdefault quality.
+    Thumbnails are cached on disk by video ID, so downloading the same video
+    again copies the cached image without touching the network. Only
+    complete images are cached; clear_thumbnail_cache() empties the cache.
+    Missing parent directories of ``output_path`` are created.
 
     Args:
         video_id: The YouTube video ID
         output_path: Path where the thumbnail should be saved
+        parallel_probes: Probe the hqdefault fallback at the same time as
+            maxresdefault, saving a round trip when maxresdefault is missing
+            at the cost of an extra HEAD request when it isn't. Pass False
+            to only contact hqdefault once maxresdefault has failed.
 
     Returns:
         True if download succeeded, False otherwise
+
+    Raises:
+        ValueError: If video_id is not a valid YouTube video ID
     """
-    # Try maxresdefault first
-    max_res_url = f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
+    _check_video_id(video_id)
+
+    # exist_ok keeps concurrent downloads into one directory from racing
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+    cache_dir = _cache_dir()
+    cache_path = cache_dir / "thumbnails" / f"{video_id}.jpg" if cache_dir else None
 
+    if cache_path is None:
+        return _fetch_thumbnail(video_id, output_path, parallel_probes)
+
+    if _is_cached(cache_path):
+        shutil.copyfile(cache_path, output_path)
+        return True
+
+    def fetch_into_cache() -> bool:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        return _fetch_thumbnail(video_id, str(cache_path), parallel_probes)
+
+    # The download is shared with concurrent callers for the same video, so it
+    # only touches the cache; each caller then copies to its own output_path
     try:
-        with urllib.request.urlopen(max_res_url) as response:
-            # Check if we got actual image data (maxresdefault exists)
-            content_length = response.headers.get("Content-Length")
-            if content_length and int(content_length) > 1000:  # Valid image
-                with open(output_path, "wb") as f:
-                    f.write(response.read())
-                return True
-    except (urllib.error.HTTPError, urllib.error.URLError):
-        pass
+        downloaded = _THUMBNAIL_FETCHES.run(video_id, fetch_into_cache)
+    except OSError:
+        # Caching is best effort; if the cache can't be written, download directly
+        return _fetch_thumbnail(video_id, output_path, parallel_probes)
+    if downloaded:
+        shutil.copyfile(cache_path, output_path)
+    return downloaded
+
 
-    # Fallback to hqdefault
-    hq_url = f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"
+def _probe(url: str) -> int | None:
+    """Send a HEAD request for an image.
 
+    Returns:
+        The Content-Length (0 if not given), or None if the request failed
+    """
     try:
-        with urllib.request.urlopen(hq_url) as response:
-            with open(output_path, "wb") as f:
-                f.write(response.read())
-        return True
-    except (urllib.error.HTTPError, urllib.error.URLError, OSError):
-        return False
+        with _POOL.request("HEAD", url) as response:
+            return int(response.headers.get("Content-Length") or 0)
+    except (urllib.error.HTTPError, urllib.error.URLError, ValueError):
+        return None
+
+
+def _fetch_thumbnail(video_id: str, output_path: str, parallel_probes: bool = True) -> bool:
+    """Download a thumbnail from YouTube, preferring the highest quality.
+
+    Probes the maxresdefault quality thumbnail with a HEAD request first and
+    only downloads it if it exists. Otherwise falls back to hqdefault quality.
+    With ``parallel_probes``, hqdefault is probed alongside maxresdefault so
+    the fallback doesn't wait for a second round trip. The cost is usually
+    an extra HEAD request per video, even when maxresdefault exists, and the
+    call doesn't return until that probe has finished.
+
+    Args:
+        video_id: The YouTube video ID
+        output_path: Path where the thumbnail should be saved
+        parallel_probes: Probe hqdefault concurrently with maxresdefault
+
+    Returns:
+        True if download succeeded, False otherwise
+    """
+    max_res_url = get_thumbnail_url(video_id)
+    hq_url = get_thumbnail_url(video_id, "hqdefault")
+    hq_probe = _EXECUTOR.submit(_probe, hq_url) if parallel_probes else None
 
+    try:
+        # Probe maxresdefault with HEAD so a missing image costs no body transfer
+        content_length = _probe(max_res_url)
+        if content_length is not None and content_length > _PLACEHOLDER_SIZE:
+            try:
+                with _POOL.request("GET", max_res_url) as response:
+                    _stream_to_file(response, output_path)
+                return True
+            except (urllib.error.HTTPError, urllib.error.URLError, http.client.HTTPException):
+                pass
+
+        # Fallback to hqdefault, unless its probe already showed it missing
+        if hq_probe is not None and hq_probe.result() is None:
+            return False
+
+        try:
+            with _POOL.request("GET", hq_url) as response:
+                _stream_to_file(response, output_path)
+            return True
+        except (urllib.error.HTTPError, urllib.error.URLError, http.client.HTTPException, OSError):
+            return False
+    finally:
+        # A probe that has started can't be cancelled; wait for it, so no
+        # request outlives the call
+        if hq_probe is not None and not hq_probe.cancel():
+            wait((hq_probe,))
+
+
+def download_many(
+    video_ids: Iterable[str], out_dir: str, concurrency: int = _DOWNLOAD_WORKERS
+) -> dict[str, bool]:
+    """Download thumbnails for several videos in parallel.
+
+    Each thumbnail is saved as {video_id}.jpg in ``out_dir``, which is
+    created if needed. Downloads are network-bound, so threads overlap
+    their waits on the socket while sharing the keep-alive connection pool.
+
+    Args:
+        video_ids: The YouTube video IDs; duplicates are downloaded once
+        out_dir: Directory to save the thumbnails in
+        concurrency: Maximum number of downloads in flight
+
+    Returns:
+        A dictionary mapping each video ID to whether its download
+        succeeded, in input order; invalid video IDs count as failures
+    """
+    unique_ids = list(dict.fromkeys(video_ids))
+    if not unique_ids:
+        return {}
+
+    directory = Path(out_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    def download(video_id: str) -> bool:
+        try:
+            return download_thumbnail(video_id, str(directory / f"{video_id}.jpg"))
+        except (OSError, ValueError):
+            # A bad ID or a file that can't be written fails this video, not the batch
+            return False
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(unique_ids))) as executor:
+        return dict(zip(unique_ids, executor.map(download, unique_ids), strict=True))
 
-def get_video_metadata(video_id: str) -> dict[str, str]:
+
+def get_thumbnail_and_metadata(
+    video_id: str, output_path: str, fast: bool = False
+) -> tuple[bool, dict[str, str]]:
+    """Download a thumbnail and fetch the video's metadata at the same time.
+
+    The metadata request runs on a background thread while the thumbnail
+    downloads in the calling thread, so the pair costs about as long as the
+    slower of the two instead of their sum.
+
+    Args:
+        video_id: The YouTube video ID
+        output_path: Path where the thumbnail should be saved
+        fast: Fetch only the title, via oEmbed (see get_video_metadata)
+
+    Returns:
+        Whether the download succeeded, and the metadata dictionary
+        described in get_video_metadata
+
+    Raises:
+        ValueError: If video_id is not a valid YouTube video ID
+    """
+    _check_video_id(video_id)
+    metadata = _EXECUTOR.submit(get_video_metadata, video_id, fast)
+    downloaded = download_thumbnail(video_id, output_path)
+    return downloaded, metadata.result()
+
+
+def get_video_metadata(video_id: str, fast: bool = False) -> dict[str, str]:
     """Fetch video metadata from YouTube.
 
     Extracts the title and description from a YouTube video page by parsing
-    the HTML meta tags. Makes a single HTTP request to the video page.
+    the HTML meta tags. Makes a single HTTP request to the video page, reusing
+    a pooled connection when one is idle.
+
+    With ``fast=True`` the title comes from YouTube's oEmbed endpoint
+    instead, a few hundred bytes of JSON rather than the whole watch page.
+    oEmbed has no description, so it is left empty.
+
+    Results are cached in memory for an hour and on disk for a day next to
+    the thumbnail cache, so repeated lookups of the same video skip the
+    request. Failed lookups (no title found) are not cached.
 
     Args:
         video_id: The YouTube video ID
+        fast: Fetch only the title, via oEmbed
 
     Returns:
         A dictionary containing:
@@ -107,12 +651,132 @@ def get_video_metadata(video_id: str) -> dict[str, str]:
         - 'description': The video description (empty string if not found)
         - 'thumbnail_url': The maxresdefault thumbnail URL
 
+    Raises:
+        ValueError: If video_id is not a valid YouTube video ID
+
     Example:
         >>> metadata = get_video_metadata('dQw4w9WgXcQ')
         >>> print(metadata['title'])
         'Rick Astley - Never Gonna Give You Up (Official Video)'
     """
-    url = f"https://www.youtube.com/watch?v={video_id}"
+    _check_video_id(video_id)
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return _fetch_metadata_once(video_id, fast, None)
+
+    # A full entry also answers fast lookups; fast entries lack descriptions
+    full_path = cache_dir / "metadata" / f"{video_id}.json"
+    own_path = cache_dir / "metadata" / f"{video_id}.oembed.json" if fast else full_path
+    entries = [(False, full_path)]
+    if fast:
+        entries.append((True, own_path))
+
+    for is_fast, _ in entries:
+        cached = _METADATA_MEMORY.get((video_id, is_fast))
+        if cached is not None:
+            return cached
+
+    for is_fast, entry_path in entries:
+        disk_entry = _load_cached_metadata(entry_path)
+        if disk_entry is not None:
+            stored, remaining = disk_entry
+            metadata = {**stored, "thumbnail_url": get_thumbnail_url(video_id)}
+            # Don't let the memory copy outlive the disk entry's one-day TTL
+            _METADATA_MEMORY.put((video_id, is_fast), metadata, remaining)
+            return metadata
+
+    return _fetch_metadata_once(video_id, fast, own_path)
+
+
+def _fetch_metadata_once(video_id: str, fast: bool, cache_path: Path | None) -> dict[str, str]:
+    """Fetch metadata, sharing the request with concurrent lookups of the video.
+
+    Successful results are stored in the memory cache and, if given, at
+    cache_path by the caller that made the request.
+    """
+
+    def fetch() -> dict[str, str]:
+        metadata = _fetch_oembed_metadata(video_id) if fast else _fetch_video_metadata(video_id)
+        if cache_path is not None and metadata["title"]:
+            _METADATA_MEMORY.put((video_id, fast), metadata)
+            _store_metadata(cache_path, metadata["title"], metadata["description"])
+        return metadata
+
+    metadata = _METADATA_FETCHES.run((video_id, fast), fetch)
+    # Callers sharing a fetch each get their own copy
+    return dict(metadata)
+
+
+def _fetch_oembed_metadata(video_id: str) -> dict[str, str]:
+    """Fetch the title of a video from the oEmbed endpoint.
+
+    Args:
+        video_id: The YouTube video ID
+
+    Returns:
+        The metadata dictionary described in get_video_metadata, with an
+        empty description
+    """
+    video_url = urllib.parse.quote(f"https://youtu.be/{video_id}", safe="")
+    url = f"{_OEMBED_URL}?url={video_url}&format=json"
+    metadata = {
+        "title": "",
+        "description": "",
+        "thumbnail_url": get_thumbnail_url(video_id),
+    }
+
+    try:
+        with _POOL.request("GET", url) as response:
+            data = json.load(response)
+        metadata["title"] = str(data.get("title", ""))
+    except (urllib.error.HTTPError, urllib.error.URLError, OSError, ValueError, AttributeError):
+        # Private, deleted or non-embeddable videos come back as 401/404
+        pass
+
+    return metadata
+
+
+def _decode_body(body: bytes, content_encoding: str | None) -> bytes:
+    """Undo the Content-Encoding of a response body.
+
+    Raises:
+        zlib.error: If the body is not valid for its declared encoding
+        EOFError: If a gzip body is truncated
+    """
+    if content_encoding == "gzip":
+        return gzip.decompress(body)
+    if content_encoding == "deflate":
+        # "deflate" should be zlib-wrapped, but some servers send raw deflate
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
+
+
+def _meta_content(pattern: re.Pattern[bytes], page: bytes) -> str:
+    """Return the content of the first meta tag matching pattern.
+
+    Only the captured attribute value is decoded. Entities such as ``&amp;``
+    and ``&#39;`` are unescaped, as a browser would.
+    """
+    match = pattern.search(page)
+    if match is None:
+        return ""
+    content = match[1] if match[1] is not None else match[2]
+    return html.unescape(content.decode("utf-8", "replace"))
+
+
+def _fetch_video_metadata(video_id: str) -> dict[str, str]:
+    """Fetch and parse the watch page for a video.
+
+    Args:
+        video_id: The YouTube video ID
+
+    Returns:
+        The metadata dictionary described in get_video_metadata
+    """
+    url = f"{_WATCH_URL}?v={video_id}"
     metadata = {
         "title": "",
         "description": "",
@@ -120,21 +784,17 @@ def get_video_metadata(video_id: str) -> dict[str, str]:
     }
 
     try:
-        # Fetch the video page HTML
-        with urllib.request.urlopen(url, timeout=10) as response:
-            html = response.read().decode("utf-8")
+        # Fetch the video page HTML over a pooled keep-alive connection
+        with _POOL.request("GET", url, _PAGE_HEADERS) as response:
+            body = _decode_body(response.read(), response.headers.get("Content-Encoding"))
 
         # Extract title from <meta property="og:title" content="...">
-        title_match = re.search(r'<meta\s+property="og:title"\s+content="([^"]*)"', html)
-        if title_match:
-            metadata["title"] = title_match.group(1)
+        metadata["title"] = _meta_content(_TITLE_PATTERN, body)
 
         # Extract description from <meta property="og:description" content="...">
-        desc_match = re.search(r'<meta\s+property="og:description"\s+content="([^"]*)"', html)
-        if desc_match:
-            metadata["description"] = desc_match.group(1)
+        metadata["description"] = _meta_content(_DESCRIPTION_PATTERN, body)
 
-    except (urllib.error.HTTPError, urllib.error.URLError, OSError):
+    except (urllib.error.HTTPError, urllib.error.URLError, OSError, zlib.error, EOFError):
         # Return empty strings for title and description on error
         pass
 
@@ -2,11 +2,32 @@
 Pytest fixtures for yt-thumbs tests
 """
 
-from unittest.mock import MagicMock
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
 from urllib.error import HTTPError, URLError
+from urllib.parse import parse_qs, urlsplit
 
 import pytest
 
+from yt_thumbs import extractor
+from yt_thumbs.extractor import _METADATA_MEMORY
+
+# Image bodies served by the fake_youtube fixture
+MAXRES_IMAGE = b"M" * 5000
+HQ_IMAGE = b"H" * 3000
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Point the on-disk cache at a per-test directory and start with an empty memory cache"""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("YT_THUMBS_CACHE", str(cache_dir))
+    _METADATA_MEMORY.clear()
+    return cache_dir
+
 
 @pytest.fixture
 def valid_watch_url():
@@ -91,6 +112,17 @@ def mock_video_html():
     """
 
 
+@pytest.fixture
+def page_request(mock_video_html):
+    """Patch the pool so every request returns the sample watch page"""
+    with patch("yt_thumbs.extractor._POOL.request") as mock_request:
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.read.return_value = mock_video_html.encode("utf-8")
+        mock_request.return_value = mock_response
+        yield mock_request
+
+
 @pytest.fixture
 def mock_video_html_no_title():
     """Mock HTML content missing title"""
@@ -181,3 +213,100 @@ https://youtu.be/jNQXAC9IVRw
     batch_file = tmp_path / "mixed.txt"
     batch_file.write_text(content)
     return batch_file
+
+
+class _FakeYouTubeHandler(BaseHTTPRequestHandler):
+    """Serves thumbnails, watch pages and oEmbed JSON like YouTube does."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; don't let Nagle delay the body
+    disable_nagle_algorithm = True
+
+    def handle(self):
+        with self.server.lock:
+            self.server.connection_count += 1
+        super().handle()
+
+    def do_HEAD(self):
+        self._respond(include_body=False)
+
+    def do_GET(self):
+        self._respond(include_body=True)
+
+    def _respond(self, include_body):
+        parts = urlsplit(self.path)
+        segments = parts.path.split("/")
+        query = parse_qs(parts.query)
+        with self.server.lock:
+            self.server.requests.append((self.command, self.path))
+
+        headers = {}
+        truncate = False
+        if parts.path.startswith("/vi/") and len(segments) == 4:
+            video_id, image = segments[2], segments[3]
+            truncate = video_id in self.server.truncated
+            if image == "maxresdefault.jpg" and video_id not in self.server.missing_maxres:
+                status, body = 200, MAXRES_IMAGE
+            elif image == "hqdefault.jpg":
+                status, body = 200, HQ_IMAGE
+            else:
+                status, body = 404, b"Not Found"
+        elif parts.path == "/watch" and "v" in query:
+            status, body = 200, self.server.watch_html.encode("utf-8")
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = gzip.compress(body)
+                headers["Content-Encoding"] = "gzip"
+        elif parts.path == "/oembed" and "url" in query:
+            status, body = 200, json.dumps({"title": "oEmbed title"}).encode("utf-8")
+        else:
+            status, body = 404, b"Not Found"
+
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if include_body and truncate:
+            # Announce the whole image but hang up partway through it
+            self.wfile.write(body[:100])
+            self.close_connection = True
+        elif include_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def fake_youtube(monkeypatch, mock_video_html):
+    """Local HTTP server standing in for img.youtube.com and www.youtube.com
+
+    The extractor's URLs are pointed at the server, so requests go through
+    the real connection pool. The server records every request and counts
+    accepted connections; add video IDs to ``missing_maxres`` to make their
+    maxresdefault image 404, or to ``truncated`` to cut their images short.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeYouTubeHandler)
+    server.lock = threading.Lock()
+    server.connection_count = 0
+    server.requests = []
+    server.missing_maxres = set()
+    server.truncated = set()
+    server.watch_html = mock_video_html
+    server.maxres_image = MAXRES_IMAGE
+    server.hq_image = HQ_IMAGE
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr(extractor, "_THUMBNAIL_BASE_URL", f"{base_url}/vi")
+    monkeypatch.setattr(extractor, "_WATCH_URL", f"{base_url}/watch")
+    monkeypatch.setattr(extractor, "_OEMBED_URL", f"{base_url}/oembed")
+    server.base_url = base_url
+
+    yield server
+
+    # Drop keep-alive connections to this server before it goes away
+    extractor._POOL.clear()
+    server.shutdown()
+    server.server_close()
@@ -5,11 +5,13 @@ Tests command-line interface including argument parsing, batch processing,
 and output handling.
 """
 
+import threading
+import time
 from unittest.mock import patch
 
 import pytest
 
-from yt_thumbs.cli import main, process_batch_urls
+from yt_thumbs.cli import main, process_batch_downloads, process_batch_urls
 
 
 class TestProcessBatchUrls:
@@ -171,6 +173,51 @@ class TestProcessBatchUrls:
         captured = capsys.readouterr()
         assert "Warning: Error processing" in captured.err
 
+    @patch("yt_thumbs.cli.get_video_metadata")
+    def test_metadata_fetched_concurrently(self, mock_metadata, batch_file, capsys):
+        """Test that metadata for all URLs is fetched in parallel"""
+        # Each fetch waits until all three are in flight; a serial loop would time out
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fetch(video_id):
+            barrier.wait()
+            return {"title": video_id, "description": "", "thumbnail_url": ""}
+
+        mock_metadata.side_effect = fetch
+
+        process_batch_urls(str(batch_file))
+
+        captured = capsys.readouterr()
+        assert "Processed 3 of 3 URLs" in captured.err
+
+    @patch("yt_thumbs.cli.get_video_metadata")
+    def test_fast_mode_fetches_via_oembed(self, mock_metadata, batch_file):
+        """Test that fast mode requests title-only metadata"""
+        mock_metadata.return_value = {"title": "Test", "description": "", "thumbnail_url": ""}
+
+        process_batch_urls(str(batch_file), fast=True)
+
+        assert mock_metadata.call_count == 3
+        assert all(call.kwargs == {"fast": True} for call in mock_metadata.call_args_list)
+
+    @patch("yt_thumbs.cli.get_video_metadata")
+    def test_output_preserves_input_order(self, mock_metadata, batch_file, capsys):
+        """Test that table rows follow the batch file order"""
+        delays = {"dQw4w9WgXcQ": 0.1, "jNQXAC9IVRw": 0.05, "abc123defgh": 0}
+
+        def fetch(video_id):
+            # Later URLs finish first
+            time.sleep(delays[video_id])
+            return {"title": video_id, "description": "", "thumbnail_url": ""}
+
+        mock_metadata.side_effect = fetch
+
+        process_batch_urls(str(batch_file))
+
+        captured = capsys.readouterr()
+        rows = captured.out.splitlines()[2:]
+        assert [row.split(" | ")[1] for row in rows] == list(delays)
+
     @patch("yt_thumbs.cli.get_video_metadata")
     def test_output_file_write_error(self, mock_metadata, batch_file, capsys):
         """Test handling of file write errors"""
@@ -189,6 +236,117 @@ class TestProcessBatchUrls:
         assert "Error: Could not write to output file" in captured.err
 
 
+class TestProcessBatchDownloads:
+    """Test batch thumbnail downloading."""
+
+    @patch("yt_thumbs.extractor.download_thumbnail")
+    def test_downloads_all_valid_urls(self, mock_download, batch_file, temp_dir, capsys):
+        """Test that each video is downloaded to {video_id}.jpg in the output dir"""
+        mock_download.return_value = True
+        output_dir = temp_dir / "thumbs"
+
+        process_batch_downloads(str(batch_file), str(output_dir))
+
+        assert output_dir.is_dir()
+        downloaded = sorted(call[0] for call in mock_download.call_args_list)
+        assert downloaded == [
+            ("abc123defgh", str(output_dir / "abc123defgh.jpg")),
+            ("dQw4w9WgXcQ", str(output_dir / "dQw4w9WgXcQ.jpg")),
+            ("jNQXAC9IVRw", str(output_dir / "jNQXAC9IVRw.jpg")),
+        ]
+        captured = capsys.readouterr()
+        assert "Downloaded 3 of 3 thumbnails" in captured.err
+
+    @patch("yt_thumbs.extractor.download_thumbnail")
+    def test_defaults_to_current_directory(self, mock_download, batch_file, temp_dir, monkeypatch):
+        """Test that thumbnails are saved in the current directory by default"""
+        monkeypatch.chdir(temp_dir)
+        mock_download.return_value = True
+
+        process_batch_downloads(str(batch_file))
+
+        assert ("dQw4w9WgXcQ", "dQw4w9WgXcQ.jpg") in [
+            call[0] for call in mock_download.call_args_list
+        ]
+
+    @patch("yt_thumbs.extractor.download_thumbnail")
+    def test_downloads_run_concurrently(self, mock_download, batch_file, temp_dir):
+        """Test that downloads run in parallel"""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def download(video_id, output_path):
+            barrier.wait()
+            return True
+
+        mock_download.side_effect = download
+
+        process_batch_downloads(str(batch_file), str(temp_dir))
+
+        assert mock_download.call_count == 3
+
+    @patch("yt_thumbs.extractor.download_thumbnail")
+    def test_duplicate_urls_downloaded_once(self, mock_download, temp_dir):
+        """Test that repeated videos are only downloaded once"""
+        batch = temp_dir / "dupes.txt"
+        batch.write_text(
+            "https://youtu.be/dQw4w9WgXcQ\nhttps://www.youtube.com/watch?v=dQw4w9WgXcQ\n"
+        )
+        mock_download.return_value = True
+
+        process_batch_downloads(str(batch), str(temp_dir))
+
+        mock_download.assert_called_once()
+
+    @patch("yt_thumbs.extractor.download_thumbnail")
+    def test_partial_failure_reported(self, mock_download, batch_file, temp_dir, capsys):
+        """Test that failed downloads are reported without aborting the batch"""
+        mock_download.side_effect = lambda video_id, path: video_id != "jNQXAC9IVRw"
+
+        process_batch_downloads(str(batch_file), str(temp_dir))
+
+        captured = capsys.readouterr()
+        assert "Failed to download thumbnail for video ID: jNQXAC9IVRw" in captured.err
+        assert "Downloaded 2 of 3 thumbnails" in captured.err
+
+    @patch("yt_thumbs.extractor.download_thumbnail")
+    def test_write_error_counts_as_failure(self, mock_download, batch_file, temp_dir, capsys):
+        """Test that file errors in one download don't abort the batch"""
+        mock_download.side_effect = PermissionError("Permission denied")
+
+        with pytest.raises(SystemExit) as exc_info:
+            process_batch_downloads(str(batch_file), str(temp_dir))
+
+        assert exc_info.value.code == 1
+        captured = capsys.readouterr()
+        assert "Failed to download thumbnail for video ID: dQw4w9WgXcQ" in captured.err
+        assert "Error: No thumbnails were downloaded" in captured.err
+
+    @patch("yt_thumbs.extractor.download_thumbnail")
+    def test_invalid_urls_skipped(
+        self, mock_download, batch_file_with_invalid_urls, temp_dir, capsys
+    ):
+        """Test that invalid URLs are skipped with a warning"""
+        mock_download.return_value = True
+
+        process_batch_downloads(str(batch_file_with_invalid_urls), str(temp_dir))
+
+        assert mock_download.call_count == 2
+        captured = capsys.readouterr()
+        assert "Warning: Skipping invalid URL" in captured.err
+
+    @patch("yt_thumbs.extractor.download_thumbnail")
+    def test_all_invalid_urls_exits(self, mock_download, temp_dir, capsys):
+        """Test that a batch with no valid URLs exits without downloading"""
+        invalid_batch = temp_dir / "invalid.txt"
+        invalid_batch.write_text("https://example.com\nnot a url\n")
+
+        with pytest.raises(SystemExit) as exc_info:
+            process_batch_downloads(str(invalid_batch), str(temp_dir))
+
+        assert exc_info.value.code == 1
+        mock_download.assert_not_called()
+
+
 class TestMainCLI:
     """Test main CLI entry point."""
 
@@ -278,7 +436,7 @@ class TestMainCLI:
         """Test batch mode calls process_batch_urls"""
         main()
 
-        mock_process.assert_called_once_with("urls.txt", None)
+        mock_process.assert_called_once_with("urls.txt", None, fast=False)
 
     @patch("yt_thumbs.cli.process_batch_urls")
     @patch("sys.argv", ["yt-thumb", "--batch", "urls.txt", "--output", "results.md"])
@@ -286,7 +444,15 @@ class TestMainCLI:
         """Test batch mode with output file"""
         main()
 
-        mock_process.assert_called_once_with("urls.txt", "results.md")
+        mock_process.assert_called_once_with("urls.txt", "results.md", fast=False)
+
+    @patch("yt_thumbs.cli.process_batch_urls")
+    @patch("sys.argv", ["yt-thumb", "--batch", "urls.txt", "--fast"])
+    def test_batch_mode_fast(self, mock_process):
+        """Test that --fast is passed through to batch processing"""
+        main()
+
+        mock_process.assert_called_once_with("urls.txt", None, fast=True)
 
     @patch("sys.argv", ["yt-thumb"])
     def test_no_arguments_shows_error(self):
@@ -304,13 +470,13 @@ class TestMainCLI:
 
         assert exc_info.value.code == 2  # argparse error
 
-    @patch("sys.argv", ["yt-thumb", "--batch", "urls.txt", "--download"])
-    def test_batch_and_download_conflict(self):
-        """Test that batch mode and download flag cannot be used together"""
-        with pytest.raises(SystemExit) as exc_info:
-            main()
+    @patch("yt_thumbs.cli.process_batch_downloads")
+    @patch("sys.argv", ["yt-thumb", "--batch", "urls.txt", "--download", "-o", "thumbs"])
+    def test_batch_mode_with_download(self, mock_process):
+        """Test that batch mode with --download calls process_batch_downloads"""
+        main()
 
-        assert exc_info.value.code == 2  # argparse error
+        mock_process.assert_called_once_with("urls.txt", "thumbs")
 
     @patch("yt_thumbs.cli.download_thumbnail")
     @patch("yt_thumbs.cli.extract_video_id")
@@ -0,0 +1,392 @@
+"""
+Tests for the keep-alive connection pool.
+
+Runs requests against a local HTTP server to check connection reuse,
+redirects and error handling.
+"""
+
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.error import HTTPError, URLError
+
+import pytest
+
+from yt_thumbs.connection import ConnectionPool
+
+IMAGE_DATA = b"x" * 2000
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves a fixed image, a 404, a redirect and a flaky path over HTTP/1.1.
+
+    /drop closes the connection after answering without announcing it, and
+    /stall never answers when it is not the first request on a connection.
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; don't let Nagle delay the body
+    disable_nagle_algorithm = True
+
+    def handle(self):
+        self.server.connection_count += 1
+        self.requests_on_connection = 0
+        super().handle()
+
+    def parse_request(self):
+        ok = super().parse_request()
+        self.server.last_headers = self.headers
+        return ok
+
+    def do_HEAD(self):
+        self._respond(include_body=False)
+
+    def do_GET(self):
+        self._respond(include_body=True)
+
+    def do_POST(self):
+        self._respond(include_body=True)
+
+    def _respond(self, include_body):
+        self.server.request_count += 1
+        self.requests_on_connection += 1
+        if self.path == "/stall" and self.requests_on_connection > 1:
+            # Hold the request until the client gives up, then hang up
+            self.server.stall_released.wait(5)
+            self.close_connection = True
+            return
+        if self.path == "/drop":
+            self.close_connection = True
+
+        if self.path == "/flaky" and self.server.failures_left:
+            self.server.failures_left -= 1
+            status, body, headers = 503, b"Service Unavailable", {}
+        elif self.path in ("/image.jpg", "/flaky", "/drop", "/stall"):
+            status, body, headers = 200, IMAGE_DATA, {}
+        elif self.path == "/redirect":
+            status, body, headers = 302, b"", {"Location": "/image.jpg"}
+        else:
+            status, body, headers = 404, b"Not Found", {}
+
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    """Local HTTP server that counts connections and requests; /flaky fails twice"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.connection_count = 0
+    server.request_count = 0
+    server.failures_left = 2
+    server.stall_released = threading.Event()
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield server
+    server.stall_released.set()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def base_url(http_server):
+    """Base URL of the local HTTP server"""
+    host, port = http_server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+@pytest.fixture
+def pool():
+    """Connection pool closed after each test"""
+    pool = ConnectionPool(maxsize=4, timeout=5)
+    yield pool
+    pool.clear()
+
+
+class TestConnectionPool:
+    """Test connection reuse and error handling."""
+
+    def test_get_returns_body(self, pool, base_url):
+        """Test a simple GET request"""
+        with pool.request("GET", f"{base_url}/image.jpg") as response:
+            assert response.status == 200
+            assert response.read() == IMAGE_DATA
+
+    def test_reuses_connection(self, pool, base_url, http_server):
+        """Test that sequential requests share one connection"""
+        for _ in range(3):
+            with pool.request("GET", f"{base_url}/image.jpg") as response:
+                response.read()
+
+        assert http_server.connection_count == 1
+
+    def test_head_then_get_share_connection(self, pool, base_url, http_server):
+        """Test that a HEAD probe leaves the connection reusable"""
+        with pool.request("HEAD", f"{base_url}/image.jpg") as response:
+            assert response.headers.get("Content-Length") == str(len(IMAGE_DATA))
+
+        with pool.request("GET", f"{base_url}/image.jpg") as response:
+            assert response.read() == IMAGE_DATA
+
+        assert http_server.connection_count == 1
+
+    def test_http_error_raised(self, pool, base_url, http_server):
+        """Test that 4xx responses raise HTTPError and keep the connection"""
+        with pytest.raises(HTTPError) as exc_info:
+            with pool.request("GET", f"{base_url}/missing.jpg"):
+                pass
+
+        assert exc_info.value.code == 404
+
+        with pool.request("GET", f"{base_url}/image.jpg") as response:
+            response.read()
+
+        assert http_server.connection_count == 1
+
+    def test_default_headers_sent(self, base_url, http_server):
+        """Test that pool-wide headers are sent and can be overridden per request"""
+        pool = ConnectionPool(headers={"User-Agent": "yt-thumbs", "X-Test": "default"})
+        try:
+            with pool.request("GET", f"{base_url}/image.jpg", {"X-Test": "override"}) as response:
+                response.read()
+        finally:
+            pool.clear()
+
+        assert http_server.last_headers["User-Agent"] == "yt-thumbs"
+        assert http_server.last_headers["X-Test"] == "override"
+
+    def test_follows_redirect(self, pool, base_url):
+        """Test that redirects are followed"""
+        with pool.request("GET", f"{base_url}/redirect") as response:
+            assert response.status == 200
+            assert response.read() == IMAGE_DATA
+
+    def test_clear_closes_idle_connections(self, pool, base_url, http_server):
+        """Test that clear() drops idle connections"""
+        with pool.request("GET", f"{base_url}/image.jpg") as response:
+            response.read()
+
+        pool.clear()
+
+        with pool.request("GET", f"{base_url}/image.jpg") as response:
+            response.read()
+
+        assert http_server.connection_count == 2
+
+    def test_https_connections_share_ssl_context(self, pool):
+        """Test that the TLS context is built once per pool"""
+        with patch("ssl.create_default_context") as mock_create:
+            first = pool._connect(("https", "img.youtube.com", None))
+            second = pool._connect(("https", "www.youtube.com", None))
+
+        mock_create.assert_called_once()
+        assert first._context is second._context
+
+    def test_dropped_idle_connection_replaced(self, pool, base_url, http_server):
+        """Test that a keep-alive connection closed by the server is replaced"""
+        for _ in range(2):
+            with pool.request("GET", f"{base_url}/drop") as response:
+                assert response.read() == IMAGE_DATA
+
+        assert http_server.connection_count == 2
+
+    def test_timeout_on_reused_connection_raises_url_error(self, base_url):
+        """Test that a reused connection timing out raises URLError and is closed"""
+        pool = ConnectionPool(timeout=0.2)
+        try:
+            with pool.request("GET", f"{base_url}/image.jpg") as response:
+                response.read()
+
+            with pytest.raises(URLError) as exc_info:
+                with pool.request("GET", f"{base_url}/stall"):
+                    pass
+
+            assert isinstance(exc_info.value.reason, TimeoutError)
+            # The timed-out connection was closed, not put back
+            assert not any(pool._idle.values())
+        finally:
+            pool.clear()
+
+    def test_connection_refused_raises_url_error(self, pool):
+        """Test that connection failures raise URLError"""
+        # Reserve a free port, then close it so nothing is listening
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        with pytest.raises(URLError):
+            with pool.request("GET", f"http://127.0.0.1:{port}/image.jpg"):
+                pass
+
+    def test_unsupported_url_raises_url_error(self, pool):
+        """Test that non-HTTP URLs are rejected"""
+        with pytest.raises(URLError):
+            with pool.request("GET", "ftp://example.com/image.jpg"):
+                pass
+
+
+class TestRetries:
+    """Test retrying of transient failures."""
+
+    @pytest.fixture
+    def retrying_pool(self):
+        """Connection pool that retries twice without waiting"""
+        pool = ConnectionPool(maxsize=4, timeout=5, retries=2, backoff=0)
+        yield pool
+        pool.clear()
+
+    def test_server_error_retried(self, retrying_pool, base_url, http_server):
+        """Test that 503 responses are retried until the request succeeds"""
+        with retrying_pool.request("GET", f"{base_url}/flaky") as response:
+            assert response.read() == IMAGE_DATA
+
+        assert http_server.request_count == 3
+        assert http_server.connection_count == 1
+
+    def test_gives_up_after_retries(self, base_url, http_server):
+        """Test that the last failure is raised once retries run out"""
+        pool = ConnectionPool(retries=1, backoff=0)
+        try:
+            with pytest.raises(HTTPError) as exc_info:
+                with pool.request("GET", f"{base_url}/flaky"):
+                    pass
+        finally:
+            pool.clear()
+
+        assert exc_info.value.code == 503
+        assert http_server.request_count == 2
+
+    def test_not_found_not_retried(self, retrying_pool, base_url, http_server):
+        """Test that 404 is returned at once, since it is an answer and not a hiccup"""
+        with pytest.raises(HTTPError):
+            with retrying_pool.request("HEAD", f"{base_url}/missing.jpg"):
+                pass
+
+        assert http_server.request_count == 1
+
+    def test_no_retries_by_default(self, pool, base_url, http_server):
+        """Test that pools don't retry unless asked to"""
+        with pytest.raises(HTTPError):
+            with pool.request("GET", f"{base_url}/flaky"):
+                pass
+
+        assert http_server.request_count == 1
+
+    def test_connection_error_retried(self, retrying_pool):
+        """Test that refused connections are retried before URLError is raised"""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        with patch.object(retrying_pool, "_connect", wraps=retrying_pool._connect) as connect:
+            with pytest.raises(URLError):
+                with retrying_pool.request("GET", f"http://127.0.0.1:{port}/image.jpg"):
+                    pass
+
+        assert connect.call_count == 3
+
+    def test_timeout_on_reused_connection_retried(self, base_url, http_server):
+        """Test that a pooled connection timing out is retried on a fresh one"""
+        pool = ConnectionPool(timeout=0.2, retries=2, backoff=0)
+        try:
+            with pool.request("GET", f"{base_url}/image.jpg") as response:
+                response.read()
+
+            with pool.request("GET", f"{base_url}/stall") as response:
+                assert response.read() == IMAGE_DATA
+        finally:
+            pool.clear()
+
+        assert http_server.connection_count == 2
+
+    def test_unsupported_method_not_retried(self, retrying_pool, base_url, http_server):
+        """Test that non-idempotent requests are sent once"""
+        with pytest.raises(HTTPError):
+            with retrying_pool.request("POST", f"{base_url}/flaky"):
+                pass
+
+        assert http_server.request_count == 1
+
+    def test_backoff_grows_between_attempts(self, base_url):
+        """Test that the delay doubles on each retry"""
+        pool = ConnectionPool(retries=2, backoff=1)
+        try:
+            with patch("time.sleep") as mock_sleep, patch("random.uniform", return_value=1):
+                with pool.request("GET", f"{base_url}/flaky") as response:
+                    response.read()
+        finally:
+            pool.clear()
+
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [1, 2]
+
+
+class TestDNSCache:
+    """Test caching of host name lookups."""
+
+    @pytest.fixture
+    def localhost_url(self, http_server):
+        """Server URL by host name, so connecting needs a lookup"""
+        return f"http://localhost:{http_server.server_address[1]}"
+
+    @staticmethod
+    def _lookups(mock_getaddrinfo):
+        """Count lookups of "localhost" (connecting to an IP makes its own calls)"""
+        return sum(call.args[0] == "localhost" for call in mock_getaddrinfo.call_args_list)
+
+    def test_lookup_shared_by_new_connections(self, localhost_url, http_server):
+        """Test that connections opened one after another resolve the host once"""
+        pool = ConnectionPool(maxsize=0)  # Keep no idle connections
+        with patch("socket.getaddrinfo", wraps=socket.getaddrinfo) as mock_getaddrinfo:
+            for _ in range(2):
+                with pool.request("GET", f"{localhost_url}/image.jpg") as response:
+                    response.read()
+
+        assert http_server.connection_count == 2
+        assert self._lookups(mock_getaddrinfo) == 1
+
+    def test_expired_lookup_repeated(self, localhost_url):
+        """Test that lookups older than dns_ttl are repeated"""
+        pool = ConnectionPool(maxsize=0)
+        with patch("socket.getaddrinfo", wraps=socket.getaddrinfo) as mock_getaddrinfo:
+            with pool.request("GET", f"{localhost_url}/image.jpg") as response:
+                response.read()
+            # Backdate the cached lookup so it has expired
+            pool._addresses = {key: (0, ips) for key, (_, ips) in pool._addresses.items()}
+            with pool.request("GET", f"{localhost_url}/image.jpg") as response:
+                response.read()
+
+        assert self._lookups(mock_getaddrinfo) == 2
+
+    def test_zero_ttl_disables_cache(self, localhost_url):
+        """Test that dns_ttl=0 leaves resolving to http.client"""
+        pool = ConnectionPool(maxsize=0, dns_ttl=0)
+        with pool.request("GET", f"{localhost_url}/image.jpg") as response:
+            response.read()
+
+        assert pool._addresses == {}
+
+    def test_unreachable_address_forgotten(self, localhost_url, http_server):
+        """Test that a cached address that refuses connections is looked up again"""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            dead_port = sock.getsockname()[1]
+
+        pool = ConnectionPool(maxsize=0)
+        port = http_server.server_address[1]
+        pool._addresses[("localhost", port)] = (float("inf"), [("127.0.0.1", dead_port)])
+
+        with pytest.raises(URLError):
+            with pool.request("GET", f"{localhost_url}/image.jpg"):
+                pass
+
+        with pool.request("GET", f"{localhost_url}/image.jpg") as response:
+            assert response.read() == IMAGE_DATA
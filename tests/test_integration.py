@@ -0,0 +1,110 @@
+"""
+End-to-end tests against a local stand-in for YouTube.
+
+Unlike the mocked unit tests, these send real HTTP requests through the
+extractor's connection pool, so they cover connection reuse, compression
+and the quality fallback on the wire.
+"""
+
+from yt_thumbs.extractor import (
+    download_many,
+    download_thumbnail,
+    get_thumbnail_and_metadata,
+    get_video_metadata,
+)
+
+VIDEO_IDS = [f"video{i:06d}" for i in range(20)]
+
+
+class TestDownloadEndToEnd:
+    """Test thumbnail downloads over HTTP."""
+
+    def test_downloads_maxres(self, fake_youtube, video_id, temp_dir):
+        """Test that maxresdefault is probed, then downloaded"""
+        output_path = temp_dir / "thumbnail.jpg"
+
+        assert download_thumbnail(video_id, str(output_path)) is True
+
+        assert output_path.read_bytes() == fake_youtube.maxres_image
+        assert ("GET", f"/vi/{video_id}/maxresdefault.jpg") in fake_youtube.requests
+        assert ("GET", f"/vi/{video_id}/hqdefault.jpg") not in fake_youtube.requests
+
+    def test_falls_back_to_hq(self, fake_youtube, video_id, temp_dir):
+        """Test that a missing maxresdefault image falls back to hqdefault"""
+        fake_youtube.missing_maxres.add(video_id)
+        output_path = temp_dir / "thumbnail.jpg"
+
+        assert download_thumbnail(video_id, str(output_path)) is True
+
+        assert output_path.read_bytes() == fake_youtube.hq_image
+        assert ("GET", f"/vi/{video_id}/maxresdefault.jpg") not in fake_youtube.requests
+
+    def test_truncated_image_not_saved(self, fake_youtube, video_id, temp_dir, cache_dir):
+        """Test that an image cut short by the server fails instead of being saved"""
+        fake_youtube.truncated.add(video_id)
+        output_path = temp_dir / "thumbnail.jpg"
+
+        assert download_thumbnail(video_id, str(output_path)) is False
+
+        assert not output_path.exists()
+        assert not (cache_dir / "thumbnails" / f"{video_id}.jpg").exists()
+
+    def test_sequential_downloads_share_connection(self, fake_youtube, temp_dir):
+        """Test that back-to-back downloads reuse one keep-alive connection"""
+        for video_id in VIDEO_IDS[:5]:
+            output_path = str(temp_dir / f"{video_id}.jpg")
+            assert download_thumbnail(video_id, output_path, parallel_probes=False)
+
+        assert len(fake_youtube.requests) == 10
+        assert fake_youtube.connection_count == 1
+
+    def test_batch_reuses_connections(self, fake_youtube, temp_dir):
+        """Test that a parallel batch opens far fewer connections than requests"""
+        concurrency = 4
+        results = download_many(VIDEO_IDS, str(temp_dir), concurrency=concurrency)
+
+        assert all(results.values())
+        # An hqdefault probe is skipped if cancelled before it starts, so count GETs only
+        gets = [path for method, path in fake_youtube.requests if method == "GET"]
+        assert len(gets) == len(VIDEO_IDS)
+        # A connection is only opened when every pooled one is in use, and each
+        # download has at most two requests in flight: its own and the probe
+        assert fake_youtube.connection_count <= 2 * concurrency
+
+    def test_repeat_download_served_from_cache(self, fake_youtube, video_id, temp_dir):
+        """Test that downloading a video twice hits the network once"""
+        download_thumbnail(video_id, str(temp_dir / "first.jpg"), parallel_probes=False)
+        request_count = len(fake_youtube.requests)
+
+        download_thumbnail(video_id, str(temp_dir / "second.jpg"), parallel_probes=False)
+
+        assert len(fake_youtube.requests) == request_count
+        assert (temp_dir / "second.jpg").read_bytes() == fake_youtube.maxres_image
+
+
+class TestMetadataEndToEnd:
+    """Test metadata lookups over HTTP."""
+
+    def test_watch_page_metadata(self, fake_youtube, video_id):
+        """Test that the gzip-compressed watch page is fetched and parsed"""
+        metadata = get_video_metadata(video_id)
+
+        assert metadata["title"] == "Rick Astley - Never Gonna Give You Up"
+        assert fake_youtube.requests == [("GET", f"/watch?v={video_id}")]
+
+    def test_fast_metadata(self, fake_youtube, video_id):
+        """Test that fast mode asks the oEmbed endpoint"""
+        metadata = get_video_metadata(video_id, fast=True)
+
+        assert metadata["title"] == "oEmbed title"
+        assert fake_youtube.requests[0][1].startswith("/oembed?url=")
+
+    def test_thumbnail_and_metadata_together(self, fake_youtube, video_id, temp_dir):
+        """Test fetching a thumbnail and its metadata in one call"""
+        output_path = temp_dir / "thumbnail.jpg"
+
+        downloaded, metadata = get_thumbnail_and_metadata(video_id, str(output_path))
+
+        assert downloaded is True
+        assert output_path.read_bytes() == fake_youtube.maxres_image
+        assert metadata["title"] == "Rick Astley - Never Gonna Give You Up"
@@ -4,12 +4,30 @@ Comprehensive tests for thumbnail extraction and download functionality.
 Tests thumbnail URL generation, downloading with quality fallback, and metadata extraction.
 """
 
+import gzip
+import io
+import os
+import threading
+import time
+import zlib
+from concurrent.futures import Future
 from unittest.mock import MagicMock, patch
 from urllib.error import HTTPError, URLError
 
 import pytest
 
-from yt_thumbs.extractor import download_thumbnail, get_thumbnail_url, get_video_metadata
+from yt_thumbs.extractor import (
+    _METADATA_MEMORY,
+    _MemoryCache,
+    _SharedCalls,
+    clear_metadata_cache,
+    clear_thumbnail_cache,
+    download_many,
+    download_thumbnail,
+    get_thumbnail_and_metadata,
+    get_thumbnail_url,
+    get_video_metadata,
+)
 
 
 class TestGetThumbnailUrl:
@@ -41,12 +59,17 @@ class TestGetThumbnailUrl:
         url = get_thumbnail_url(video_id)
         assert url == "https://img.youtube.com/vi/test-video_1/maxresdefault.jpg"
 
+    def test_other_quality(self, video_id):
+        """Test URL generation for a lower quality thumbnail"""
+        url = get_thumbnail_url(video_id, "hqdefault")
+        assert url == f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"
+
 
 class TestDownloadThumbnail:
     """Test thumbnail downloading with quality fallback."""
 
-    @patch("urllib.request.urlopen")
-    def test_successful_download_maxres(self, mock_urlopen, video_id, temp_dir):
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_successful_download_maxres(self, mock_request, video_id, temp_dir):
         """Test successful download of maxresdefault quality"""
         output_path = temp_dir / "thumbnail.jpg"
 
@@ -54,8 +77,8 @@ class TestDownloadThumbnail:
         mock_response = MagicMock()
         mock_response.__enter__.return_value = mock_response
         mock_response.headers.get.return_value = "5000"  # >1000 bytes
-        mock_response.read.return_value = b"fake image data"
-        mock_urlopen.return_value = mock_response
+        mock_response.readinto.side_effect = io.BytesIO(b"fake image data").readinto
+        mock_request.return_value = mock_response
 
         result = download_thumbnail(video_id, str(output_path))
 
@@ -63,8 +86,8 @@ class TestDownloadThumbnail:
         assert output_path.exists()
         assert output_path.read_bytes() == b"fake image data"
 
-    @patch("urllib.request.urlopen")
-    def test_fallback_to_hqdefault(self, mock_urlopen, video_id, temp_dir):
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_fallback_to_hqdefault(self, mock_request, video_id, temp_dir):
         """Test fallback to hqdefault when maxres fails"""
         output_path = temp_dir / "thumbnail.jpg"
 
@@ -72,14 +95,14 @@ class TestDownloadThumbnail:
         # Second call (hqdefault) succeeds
         mock_response = MagicMock()
         mock_response.__enter__.return_value = mock_response
-        mock_response.read.return_value = b"hq image data"
+        mock_response.readinto.side_effect = io.BytesIO(b"hq image data").readinto
 
-        def side_effect(url):
+        def side_effect(method, url):
             if "maxresdefault" in url:
                 raise HTTPError(url, 404, "Not Found", {}, None)
             return mock_response
 
-        mock_urlopen.side_effect = side_effect
+        mock_request.side_effect = side_effect
 
         result = download_thumbnail(video_id, str(output_path))
 
@@ -87,8 +110,8 @@ class TestDownloadThumbnail:
         assert output_path.exists()
         assert output_path.read_bytes() == b"hq image data"
 
-    @patch("urllib.request.urlopen")
-    def test_fallback_on_small_content_length(self, mock_urlopen, video_id, temp_dir):
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_fallback_on_small_content_length(self, mock_request, video_id, temp_dir):
         """Test fallback when maxres returns small content (thumbnail not available)"""
         output_path = temp_dir / "thumbnail.jpg"
 
@@ -100,104 +123,451 @@ class TestDownloadThumbnail:
         # Second call (hqdefault) succeeds
         mock_hq = MagicMock()
         mock_hq.__enter__.return_value = mock_hq
-        mock_hq.read.return_value = b"hq image data"
+        mock_hq.readinto.side_effect = io.BytesIO(b"hq image data").readinto
 
-        mock_urlopen.side_effect = [mock_maxres, mock_hq]
+        mock_request.side_effect = lambda method, url: (
+            mock_maxres if "maxresdefault" in url else mock_hq
+        )
 
         result = download_thumbnail(video_id, str(output_path))
 
         assert result is True
         assert output_path.exists()
+        # The placeholder is only probed with HEAD, never downloaded
+        maxres_calls = [c[0] for c in mock_request.call_args_list if "maxresdefault" in c[0][1]]
+        assert [method for method, url in maxres_calls] == ["HEAD"]
+        mock_maxres.readinto.assert_not_called()
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_partial_file_removed_on_stream_error(self, mock_request, video_id, temp_dir):
+        """Test that a download interrupted mid-stream leaves no partial file"""
+        output_path = temp_dir / "thumbnail.jpg"
+
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.headers.get.return_value = "500"  # Skip maxres, use hqdefault
+        mock_response.readinto.side_effect = [7, URLError("Connection reset")]
+        mock_request.return_value = mock_response
+
+        result = download_thumbnail(video_id, str(output_path))
+
+        assert result is False
+        assert not output_path.exists()
+        # No partial file left behind, in the output directory or the cache
+        assert [path for path in temp_dir.rglob("*") if path.is_file()] == []
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_failed_download_keeps_existing_file(self, mock_request, video_id, temp_dir):
+        """Test that an interrupted download doesn't clobber an existing file"""
+        output_path = temp_dir / "thumbnail.jpg"
+        output_path.write_bytes(b"previous image")
+
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.headers.get.return_value = "500"  # Skip maxres, use hqdefault
+        mock_response.readinto.side_effect = [7, URLError("Connection reset")]
+        mock_request.return_value = mock_response
+
+        result = download_thumbnail(video_id, str(output_path))
+
+        assert result is False
+        assert output_path.read_bytes() == b"previous image"
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_part_file_removed_when_rename_fails(self, mock_request, video_id, temp_dir):
+        """Test that the temporary file is cleaned up if moving it into place fails"""
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.headers.get.return_value = "5000"
+        mock_response.readinto.side_effect = io.BytesIO(b"fake image data").readinto
+        mock_request.return_value = mock_response
+
+        with patch("os.replace", side_effect=OSError("rename failed")):
+            with pytest.raises(OSError):
+                download_thumbnail(video_id, str(temp_dir / "thumbnail.jpg"))
+
+        assert [path for path in temp_dir.rglob("*") if path.is_file()] == []
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_other_writers_part_file_untouched(self, mock_request, video_id, temp_dir, cache_dir):
+        """Test that a download doesn't share its temporary file with another process"""
+        output_path = temp_dir / "thumbnail.jpg"
+        other_part = cache_dir / "thumbnails" / f"{video_id}.jpg.part"
+        other_part.parent.mkdir(parents=True)
+        other_part.write_bytes(b"another process")
+
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.headers.get.return_value = "5000"
+        mock_response.readinto.side_effect = io.BytesIO(b"fake image data").readinto
+        mock_request.return_value = mock_response
+
+        assert download_thumbnail(video_id, str(output_path), parallel_probes=False) is True
+        assert output_path.read_bytes() == b"fake image data"
+        assert other_part.read_bytes() == b"another process"
 
-    @patch("urllib.request.urlopen")
-    def test_both_qualities_fail_404(self, mock_urlopen, video_id, temp_dir):
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_both_qualities_fail_404(self, mock_request, video_id, temp_dir):
         """Test complete failure when both qualities return 404"""
         output_path = temp_dir / "thumbnail.jpg"
 
         # Both calls raise 404
-        mock_urlopen.side_effect = HTTPError("", 404, "Not Found", {}, None)
+        mock_request.side_effect = HTTPError("", 404, "Not Found", {}, None)
 
         result = download_thumbnail(video_id, str(output_path))
 
         assert result is False
         assert not output_path.exists()
 
-    @patch("urllib.request.urlopen")
-    def test_network_error(self, mock_urlopen, video_id, temp_dir):
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_network_error(self, mock_request, video_id, temp_dir):
         """Test handling of network errors"""
         output_path = temp_dir / "thumbnail.jpg"
 
         # Network error on all attempts
-        mock_urlopen.side_effect = URLError("Network unreachable")
+        mock_request.side_effect = URLError("Network unreachable")
 
         result = download_thumbnail(video_id, str(output_path))
 
         assert result is False
         assert not output_path.exists()
 
-    @patch("urllib.request.urlopen")
-    def test_file_write_error(self, mock_urlopen, video_id):
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_file_write_error(self, mock_request, video_id, temp_dir):
         """Test handling of file write errors"""
         # Mock successful response
         mock_response = MagicMock()
         mock_response.__enter__.return_value = mock_response
         mock_response.headers.get.return_value = "5000"
-        mock_response.read.return_value = b"fake image data"
-        mock_urlopen.return_value = mock_response
+        mock_response.readinto.side_effect = io.BytesIO(b"fake image data").readinto
+        mock_request.return_value = mock_response
 
-        # Invalid path that will cause OSError
-        invalid_path = "/invalid/path/that/does/not/exist/thumbnail.jpg"
+        # A regular file where a parent directory should be causes OSError
+        blocker = temp_dir / "not_a_directory"
+        blocker.write_text("")
+        invalid_path = str(blocker / "thumbnail.jpg")
 
-        # The current implementation doesn't catch OSError on file write
-        # It only catches on the fallback hqdefault download
-        # So we expect this to raise an exception
+        # OSError from writing the maxresdefault image is not caught,
+        # so we expect this to raise an exception
         with pytest.raises((OSError, FileNotFoundError, PermissionError)):
             download_thumbnail(video_id, invalid_path)
 
-    @patch("urllib.request.urlopen")
-    def test_creates_parent_directory(self, mock_urlopen, video_id, temp_dir):
-        """Test that parent directories are NOT created (documents current behavior)"""
-        # Note: The current implementation doesn't create parent dirs
-        # This test documents the current behavior
-        output_path = temp_dir / "subdir" / "thumbnail.jpg"
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_creates_parent_directory(self, mock_request, video_id, temp_dir):
+        """Test that missing parent directories are created"""
+        output_path = temp_dir / "subdir" / "nested" / "thumbnail.jpg"
 
         mock_response = MagicMock()
         mock_response.__enter__.return_value = mock_response
         mock_response.headers.get.return_value = "5000"
-        mock_response.read.return_value = b"fake image data"
-        mock_urlopen.return_value = mock_response
+        mock_response.readinto.side_effect = io.BytesIO(b"fake image data").readinto
+        mock_request.return_value = mock_response
+
+        assert download_thumbnail(video_id, str(output_path)) is True
+        assert output_path.read_bytes() == b"fake image data"
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_cache_hit_creates_parent_directory(self, mock_request, video_id, temp_dir, cache_dir):
+        """Test that a cached thumbnail can be copied into a new directory"""
+        cached = cache_dir / "thumbnails" / f"{video_id}.jpg"
+        cached.parent.mkdir(parents=True)
+        cached.write_bytes(b"cached image data")
+        output_path = temp_dir / "subdir" / "thumbnail.jpg"
 
-        # Parent directory doesn't exist, so this will raise FileNotFoundError
-        with pytest.raises((OSError, FileNotFoundError)):
-            download_thumbnail(video_id, str(output_path))
+        assert download_thumbnail(video_id, str(output_path)) is True
+        assert output_path.read_bytes() == b"cached image data"
 
-    @patch("urllib.request.urlopen")
-    def test_urlopen_called_with_correct_urls(self, mock_urlopen, video_id, temp_dir):
-        """Test that urlopen is called with correct thumbnail URLs"""
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_request_called_with_correct_urls(self, mock_request, video_id, temp_dir):
+        """Test that requests are made for the correct thumbnail URLs"""
         output_path = temp_dir / "thumbnail.jpg"
 
         # Both calls fail to test that both URLs are tried
-        mock_urlopen.side_effect = HTTPError("", 404, "Not Found", {}, None)
+        mock_request.side_effect = HTTPError("", 404, "Not Found", {}, None)
 
         download_thumbnail(video_id, str(output_path))
 
-        # Verify both maxresdefault and hqdefault URLs were attempted
-        calls = mock_urlopen.call_args_list
+        # Verify both maxresdefault and hqdefault URLs were probed; with both
+        # missing, nothing is downloaded
+        calls = sorted(c[0] for c in mock_request.call_args_list)
+        assert calls == [
+            ("HEAD", f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"),
+            ("HEAD", f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"),
+        ]
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_sequential_probes(self, mock_request, video_id, temp_dir):
+        """Test that parallel_probes=False only contacts hqdefault after maxres fails"""
+        output_path = temp_dir / "thumbnail.jpg"
+
+        # Both calls fail to test that both URLs are tried
+        mock_request.side_effect = HTTPError("", 404, "Not Found", {}, None)
+
+        download_thumbnail(video_id, str(output_path), parallel_probes=False)
+
+        calls = mock_request.call_args_list
         assert len(calls) == 2
-        assert "maxresdefault" in str(calls[0])
-        assert "hqdefault" in str(calls[1])
+        assert calls[0][0] == ("HEAD", f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg")
+        assert calls[1][0] == ("GET", f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg")
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_probes_run_concurrently(self, mock_request, video_id, temp_dir):
+        """Test that both qualities are probed at the same time"""
+        output_path = temp_dir / "thumbnail.jpg"
+        barrier = threading.Barrier(2, timeout=5)
+
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.headers.get.return_value = "5000"
+        mock_response.readinto.side_effect = io.BytesIO(b"maxres image data").readinto
+
+        def request(method, url):
+            # Each HEAD waits until the other is in flight; sequential probes would time out
+            if method == "HEAD":
+                barrier.wait()
+            return mock_response
+
+        mock_request.side_effect = request
+
+        assert download_thumbnail(video_id, str(output_path)) is True
+        assert output_path.read_bytes() == b"maxres image data"
+        get_calls = [c[0] for c in mock_request.call_args_list if c[0][0] == "GET"]
+        assert get_calls == [("GET", f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg")]
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_running_probe_finishes_before_return(self, mock_request, video_id, temp_dir):
+        """Test that an hqdefault probe in flight is waited for, not left running"""
+        hq_started, hq_done = threading.Event(), threading.Event()
+
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.headers.get.return_value = "5000"
+        mock_response.readinto.side_effect = io.BytesIO(b"maxres image data").readinto
+
+        def request(method, url):
+            if "hqdefault" in url:
+                hq_started.set()
+                time.sleep(0.1)
+                hq_done.set()
+            elif method == "HEAD":
+                hq_started.wait(timeout=5)  # Past the point where cancel() helps
+            return mock_response
+
+        mock_request.side_effect = request
+
+        assert download_thumbnail(video_id, str(temp_dir / "thumbnail.jpg")) is True
+        assert hq_done.is_set()
+
+    @pytest.mark.parametrize("bad_id", ["../../x/abcde", "short", "dQw4w9WgXcQ/.."])
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_invalid_video_id_rejected(self, mock_request, bad_id, temp_dir, cache_dir):
+        """Test that IDs which could escape the cache directory are refused"""
+        with pytest.raises(ValueError):
+            download_thumbnail(bad_id, str(temp_dir / "thumbnail.jpg"))
+
+        mock_request.assert_not_called()
+        assert not cache_dir.exists()
+
+
+class TestThumbnailCache:
+    """Test the on-disk thumbnail cache."""
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_download_populates_cache(self, mock_request, video_id, temp_dir, cache_dir):
+        """Test that a downloaded thumbnail is stored in the cache"""
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.headers.get.return_value = "5000"
+        mock_response.readinto.side_effect = io.BytesIO(b"fake image data").readinto
+        mock_request.return_value = mock_response
+
+        assert download_thumbnail(video_id, str(temp_dir / "thumbnail.jpg")) is True
+
+        cached = cache_dir / "thumbnails" / f"{video_id}.jpg"
+        assert cached.read_bytes() == b"fake image data"
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_cache_hit_skips_network(self, mock_request, video_id, temp_dir, cache_dir):
+        """Test that a cached thumbnail is copied without any request"""
+        cached = cache_dir / "thumbnails" / f"{video_id}.jpg"
+        cached.parent.mkdir(parents=True)
+        cached.write_bytes(b"cached image data")
+        output_path = temp_dir / "thumbnail.jpg"
+
+        result = download_thumbnail(video_id, str(output_path))
+
+        assert result is True
+        assert output_path.read_bytes() == b"cached image data"
+        mock_request.assert_not_called()
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_empty_cache_entry_ignored(self, mock_request, video_id, temp_dir, cache_dir):
+        """Test that an empty cache file triggers a fresh download"""
+        cached = cache_dir / "thumbnails" / f"{video_id}.jpg"
+        cached.parent.mkdir(parents=True)
+        cached.write_bytes(b"")
+
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.headers.get.return_value = "5000"
+        mock_response.readinto.side_effect = io.BytesIO(b"fake image data").readinto
+        mock_request.return_value = mock_response
+
+        output_path = temp_dir / "thumbnail.jpg"
+        assert download_thumbnail(video_id, str(output_path)) is True
+        assert output_path.read_bytes() == b"fake image data"
+        assert cached.read_bytes() == b"fake image data"
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_failed_download_not_cached(self, mock_request, video_id, temp_dir, cache_dir):
+        """Test that failures leave the cache empty"""
+        mock_request.side_effect = HTTPError("", 404, "Not Found", {}, None)
+
+        assert download_thumbnail(video_id, str(temp_dir / "thumbnail.jpg")) is False
+        assert not (cache_dir / "thumbnails" / f"{video_id}.jpg").exists()
+
+    def test_clear_thumbnail_cache(self, video_id, cache_dir):
+        """Test that clearing drops cached thumbnails but keeps cached metadata"""
+        cached = cache_dir / "thumbnails" / f"{video_id}.jpg"
+        cached.parent.mkdir(parents=True)
+        cached.write_bytes(b"cached image data")
+        metadata = cache_dir / "metadata" / f"{video_id}.json"
+        metadata.parent.mkdir(parents=True)
+        metadata.write_text("{}")
+
+        clear_thumbnail_cache()
+
+        assert not cached.exists()
+        assert metadata.exists()
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_empty_env_var_disables_cache(self, mock_request, video_id, temp_dir, monkeypatch):
+        """Test that YT_THUMBS_CACHE='' turns caching off"""
+        monkeypatch.setenv("YT_THUMBS_CACHE", "")
+        monkeypatch.chdir(temp_dir)
+
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.headers.get.return_value = "5000"
+        mock_response.readinto.side_effect = io.BytesIO(b"fake image data").readinto
+        mock_request.return_value = mock_response
+
+        assert download_thumbnail(video_id, "thumbnail.jpg") is True
+        assert sorted(p.name for p in temp_dir.iterdir()) == ["thumbnail.jpg"]
+
+
+class TestDownloadMany:
+    """Test parallel downloads of several thumbnails."""
+
+    @patch("yt_thumbs.extractor.download_thumbnail")
+    def test_saves_each_video_in_out_dir(self, mock_download, temp_dir):
+        """Test that each video is saved as {video_id}.jpg and results keep input order"""
+        mock_download.side_effect = lambda video_id, path: video_id != "jNQXAC9IVRw"
+        out_dir = temp_dir / "thumbs"
+
+        results = download_many(["dQw4w9WgXcQ", "jNQXAC9IVRw"], str(out_dir))
+
+        assert results == {"dQw4w9WgXcQ": True, "jNQXAC9IVRw": False}
+        assert out_dir.is_dir()
+        mock_download.assert_any_call("dQw4w9WgXcQ", str(out_dir / "dQw4w9WgXcQ.jpg"))
+
+    @patch("yt_thumbs.extractor.download_thumbnail")
+    def test_downloads_run_concurrently(self, mock_download, temp_dir):
+        """Test that downloads overlap instead of running one after another"""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def download(video_id, output_path):
+            barrier.wait()
+            return True
+
+        mock_download.side_effect = download
+
+        results = download_many(["aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc"], str(temp_dir))
+
+        assert all(results.values())
+
+    @patch("yt_thumbs.extractor.download_thumbnail")
+    def test_duplicates_downloaded_once(self, mock_download, video_id, temp_dir):
+        """Test that a repeated video ID is only downloaded once"""
+        mock_download.return_value = True
+
+        assert download_many([video_id, video_id], str(temp_dir)) == {video_id: True}
+        mock_download.assert_called_once()
+
+    @patch("yt_thumbs.extractor.download_thumbnail")
+    def test_write_error_counts_as_failure(self, mock_download, video_id, temp_dir):
+        """Test that a file error fails that video instead of raising"""
+        mock_download.side_effect = PermissionError("Permission denied")
+
+        assert download_many([video_id], str(temp_dir)) == {video_id: False}
+
+    def test_empty_input(self, temp_dir):
+        """Test that no video IDs means no work and no directory"""
+        out_dir = temp_dir / "thumbs"
+
+        assert download_many([], str(out_dir)) == {}
+        assert not out_dir.exists()
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_invalid_video_id_counts_as_failure(self, mock_request, video_id, temp_dir):
+        """Test that an ID unfit for a file name fails without writing anywhere"""
+        out_dir = temp_dir / "thumbs"
+
+        assert download_many(["../escape.."], str(out_dir)) == {"../escape..": False}
+
+        mock_request.assert_not_called()
+        assert list(temp_dir.rglob("*.jpg")) == []
+
+
+class TestGetThumbnailAndMetadata:
+    """Test fetching a thumbnail and its metadata together."""
+
+    @patch("yt_thumbs.extractor.get_video_metadata")
+    @patch("yt_thumbs.extractor.download_thumbnail")
+    def test_requests_overlap(self, mock_download, mock_metadata, video_id, temp_dir):
+        """Test that the download and the metadata fetch run at the same time"""
+        barrier = threading.Barrier(2, timeout=5)
+        metadata = {"title": "Test", "description": "", "thumbnail_url": ""}
+
+        def download(video_id, output_path):
+            barrier.wait()
+            return True
+
+        def fetch(video_id, fast):
+            barrier.wait()
+            return metadata
+
+        mock_download.side_effect = download
+        mock_metadata.side_effect = fetch
+        output_path = str(temp_dir / "thumbnail.jpg")
+
+        result = get_thumbnail_and_metadata(video_id, output_path, fast=True)
+
+        assert result == (True, metadata)
+        mock_download.assert_called_once_with(video_id, output_path)
+        mock_metadata.assert_called_once_with(video_id, True)
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_failures_reported_separately(self, mock_request, video_id, temp_dir):
+        """Test that a failed download still returns (empty) metadata"""
+        mock_request.side_effect = URLError("Network unreachable")
+
+        downloaded, metadata = get_thumbnail_and_metadata(video_id, str(temp_dir / "thumbnail.jpg"))
+
+        assert downloaded is False
+        assert metadata["title"] == ""
 
 
 class TestGetVideoMetadata:
     """Test video metadata extraction."""
 
-    @patch("urllib.request.urlopen")
-    def test_successful_metadata_extraction(self, mock_urlopen, video_id, mock_video_html):
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_successful_metadata_extraction(self, mock_request, video_id, mock_video_html):
         """Test successful extraction of title, description, and thumbnail"""
         mock_response = MagicMock()
         mock_response.__enter__.return_value = mock_response
         mock_response.read.return_value = mock_video_html.encode("utf-8")
-        mock_urlopen.return_value = mock_response
+        mock_request.return_value = mock_response
 
         metadata = get_video_metadata(video_id)
 
@@ -210,13 +580,13 @@ class TestGetVideoMetadata:
             metadata["thumbnail_url"] == f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
         )
 
-    @patch("urllib.request.urlopen")
-    def test_missing_title(self, mock_urlopen, video_id, mock_video_html_no_title):
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_missing_title(self, mock_request, video_id, mock_video_html_no_title):
         """Test metadata extraction when title is missing"""
         mock_response = MagicMock()
         mock_response.__enter__.return_value = mock_response
         mock_response.read.return_value = mock_video_html_no_title.encode("utf-8")
-        mock_urlopen.return_value = mock_response
+        mock_request.return_value = mock_response
 
         metadata = get_video_metadata(video_id)
 
@@ -224,13 +594,13 @@ class TestGetVideoMetadata:
         assert metadata["description"] == "Some description"
         assert "thumbnail_url" in metadata
 
-    @patch("urllib.request.urlopen")
-    def test_missing_description(self, mock_urlopen, video_id, mock_video_html_no_description):
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_missing_description(self, mock_request, video_id, mock_video_html_no_description):
         """Test metadata extraction when description is missing"""
         mock_response = MagicMock()
         mock_response.__enter__.return_value = mock_response
         mock_response.read.return_value = mock_video_html_no_description.encode("utf-8")
-        mock_urlopen.return_value = mock_response
+        mock_request.return_value = mock_response
 
         metadata = get_video_metadata(video_id)
 
@@ -238,10 +608,10 @@ class TestGetVideoMetadata:
         assert metadata["description"] == ""
         assert "thumbnail_url" in metadata
 
-    @patch("urllib.request.urlopen")
-    def test_network_error_returns_empty_metadata(self, mock_urlopen, video_id):
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_network_error_returns_empty_metadata(self, mock_request, video_id):
         """Test that network errors return empty metadata gracefully"""
-        mock_urlopen.side_effect = URLError("Network unreachable")
+        mock_request.side_effect = URLError("Network unreachable")
 
         metadata = get_video_metadata(video_id)
 
@@ -251,10 +621,10 @@ class TestGetVideoMetadata:
             metadata["thumbnail_url"] == f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
         )
 
-    @patch("urllib.request.urlopen")
-    def test_http_error_returns_empty_metadata(self, mock_urlopen, video_id):
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_http_error_returns_empty_metadata(self, mock_request, video_id):
         """Test that HTTP errors return empty metadata gracefully"""
-        mock_urlopen.side_effect = HTTPError("", 404, "Not Found", {}, None)
+        mock_request.side_effect = HTTPError("", 404, "Not Found", {}, None)
 
         metadata = get_video_metadata(video_id)
 
@@ -262,13 +632,13 @@ class TestGetVideoMetadata:
         assert metadata["description"] == ""
         assert "thumbnail_url" in metadata
 
-    @patch("urllib.request.urlopen")
-    def test_malformed_html(self, mock_urlopen, video_id):
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_malformed_html(self, mock_request, video_id):
         """Test handling of malformed HTML without meta tags"""
         mock_response = MagicMock()
         mock_response.__enter__.return_value = mock_response
         mock_response.read.return_value = b"<html><body>No meta tags here</body></html>"
-        mock_urlopen.return_value = mock_response
+        mock_request.return_value = mock_response
 
         metadata = get_video_metadata(video_id)
 
@@ -276,13 +646,13 @@ class TestGetVideoMetadata:
         assert metadata["description"] == ""
         assert "thumbnail_url" in metadata
 
-    @patch("urllib.request.urlopen")
-    def test_empty_html_response(self, mock_urlopen, video_id):
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_empty_html_response(self, mock_request, video_id):
         """Test handling of empty HTML response"""
         mock_response = MagicMock()
         mock_response.__enter__.return_value = mock_response
         mock_response.read.return_value = b""
-        mock_urlopen.return_value = mock_response
+        mock_request.return_value = mock_response
 
         metadata = get_video_metadata(video_id)
 
@@ -290,10 +660,10 @@ class TestGetVideoMetadata:
         assert metadata["description"] == ""
         assert "thumbnail_url" in metadata
 
-    @patch("urllib.request.urlopen")
-    def test_timeout_error(self, mock_urlopen, video_id):
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_timeout_error(self, mock_request, video_id):
         """Test handling of timeout errors"""
-        mock_urlopen.side_effect = OSError("Timeout")
+        mock_request.side_effect = OSError("Timeout")
 
         metadata = get_video_metadata(video_id)
 
@@ -301,24 +671,78 @@ class TestGetVideoMetadata:
         assert metadata["description"] == ""
         assert "thumbnail_url" in metadata
 
-    @patch("urllib.request.urlopen")
-    def test_urlopen_called_with_correct_url(self, mock_urlopen, video_id):
-        """Test that urlopen is called with correct YouTube video URL"""
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_request_called_with_correct_url(self, mock_request, video_id):
+        """Test that the watch page is requested with the correct URL"""
         mock_response = MagicMock()
         mock_response.__enter__.return_value = mock_response
         mock_response.read.return_value = b"<html></html>"
-        mock_urlopen.return_value = mock_response
+        mock_request.return_value = mock_response
 
         get_video_metadata(video_id)
 
         expected_url = f"https://www.youtube.com/watch?v={video_id}"
-        mock_urlopen.assert_called_once()
-        call_args = mock_urlopen.call_args
-        assert call_args[0][0] == expected_url
-        assert call_args[1]["timeout"] == 10
+        mock_request.assert_called_once()
+        method, url = mock_request.call_args[0][:2]
+        assert (method, url) == ("GET", expected_url)
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_gzip_response_decompressed(self, mock_request, video_id, mock_video_html):
+        """Test that a gzip-encoded watch page is requested and decompressed"""
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.read.return_value = gzip.compress(mock_video_html.encode("utf-8"))
+        mock_response.headers = {"Content-Encoding": "gzip"}
+        mock_request.return_value = mock_response
+
+        metadata = get_video_metadata(video_id)
+
+        assert metadata["title"] == "Rick Astley - Never Gonna Give You Up"
+        headers = mock_request.call_args[0][2]
+        assert headers["Accept-Encoding"] == "gzip, deflate"
+
+    @pytest.mark.parametrize(
+        "compress",
+        [zlib.compress, lambda data: zlib.compress(data)[2:-4]],
+        ids=["zlib-wrapped", "raw"],
+    )
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_deflate_response_decompressed(self, mock_request, compress, video_id, mock_video_html):
+        """Test that deflate-encoded pages are decompressed, with or without the zlib header"""
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.read.return_value = compress(mock_video_html.encode("utf-8"))
+        mock_response.headers = {"Content-Encoding": "deflate"}
+        mock_request.return_value = mock_response
+
+        metadata = get_video_metadata(video_id)
 
-    @patch("urllib.request.urlopen")
-    def test_special_characters_in_metadata(self, mock_urlopen, video_id):
+        assert metadata["title"] == "Rick Astley - Never Gonna Give You Up"
+
+    @pytest.mark.parametrize(
+        ("encoding", "body"),
+        [
+            ("gzip", b"definitely not compressed"),
+            ("deflate", b"definitely not compressed"),
+            # Cut off mid-stream, which gzip reports as EOFError
+            ("gzip", gzip.compress(b"<html>" * 100)[:-20]),
+        ],
+    )
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_corrupt_compressed_body(self, mock_request, encoding, body, video_id):
+        """Test that a body that fails to decompress returns empty metadata"""
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.read.return_value = body
+        mock_response.headers = {"Content-Encoding": encoding}
+        mock_request.return_value = mock_response
+
+        metadata = get_video_metadata(video_id)
+
+        assert metadata["title"] == ""
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_special_characters_in_metadata(self, mock_request, video_id):
         """Test handling of special characters in title and description"""
         html_with_special_chars = """
         <html>
@@ -331,7 +755,7 @@ class TestGetVideoMetadata:
         mock_response = MagicMock()
         mock_response.__enter__.return_value = mock_response
         mock_response.read.return_value = html_with_special_chars.encode("utf-8")
-        mock_urlopen.return_value = mock_response
+        mock_request.return_value = mock_response
 
         metadata = get_video_metadata(video_id)
 
@@ -341,8 +765,54 @@ class TestGetVideoMetadata:
         # Description captures until closing quote properly
         assert "Description with <tags> & symbols" in metadata["description"]
 
-    @patch("urllib.request.urlopen")
-    def test_unicode_in_metadata(self, mock_urlopen, video_id):
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_invalid_utf8_outside_meta_tags(self, mock_request, video_id, mock_video_html):
+        """Test that undecodable bytes elsewhere in the page don't lose the metadata"""
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.read.return_value = mock_video_html.encode("utf-8") + b"\xff\xfe"
+        mock_request.return_value = mock_response
+
+        metadata = get_video_metadata(video_id)
+
+        assert metadata["title"] == "Rick Astley - Never Gonna Give You Up"
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_html_entities_unescaped(self, mock_request, video_id):
+        """Test that escaped quotes and ampersands come back as plain text"""
+        html_with_entities = """
+        <meta property="og:title" content="Tom &amp; Jerry &quot;Live&quot; &#39;99">
+        <meta property="og:description" content="Caf&eacute; &lt;3">
+        """
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.read.return_value = html_with_entities.encode("utf-8")
+        mock_request.return_value = mock_response
+
+        metadata = get_video_metadata(video_id)
+
+        assert metadata["title"] == 'Tom & Jerry "Live" \'99'
+        assert metadata["description"] == "Café <3"
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_single_quoted_attributes(self, mock_request, video_id):
+        """Test that single-quoted meta attributes are recognised"""
+        html_single_quoted = """
+        <meta property='og:title' content='Say "hi"'>
+        <meta property='og:description' content=''>
+        """
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.read.return_value = html_single_quoted.encode("utf-8")
+        mock_request.return_value = mock_response
+
+        metadata = get_video_metadata(video_id)
+
+        assert metadata["title"] == 'Say "hi"'
+        assert metadata["description"] == ""
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_unicode_in_metadata(self, mock_request, video_id):
         """Test handling of Unicode characters in metadata"""
         html_with_unicode = """
         <html>
@@ -355,9 +825,376 @@ class TestGetVideoMetadata:
         mock_response = MagicMock()
         mock_response.__enter__.return_value = mock_response
         mock_response.read.return_value = html_with_unicode.encode("utf-8")
-        mock_urlopen.return_value = mock_response
+        mock_request.return_value = mock_response
 
         metadata = get_video_metadata(video_id)
 
         assert "日本語" in metadata["title"]
         assert "🎵" in metadata["description"]
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_invalid_video_id_rejected(self, mock_request, cache_dir):
+        """Test that IDs which could escape the cache directory are refused"""
+        with pytest.raises(ValueError):
+            get_video_metadata("../../../x")
+
+        mock_request.assert_not_called()
+        assert not cache_dir.exists()
+
+
+class TestMetadataCache:
+    """Test the on-disk video metadata cache."""
+
+    def test_repeat_lookup_served_from_cache(self, page_request, video_id):
+        """Test that a second lookup of the same video makes no request"""
+        first = get_video_metadata(video_id)
+        second = get_video_metadata(video_id)
+
+        assert second == first
+        page_request.assert_called_once()
+
+    def test_expired_entry_refetched(self, page_request, video_id, cache_dir):
+        """Test that entries older than a day are fetched again"""
+        get_video_metadata(video_id)
+        entry = cache_dir / "metadata" / f"{video_id}.json"
+        stale = time.time() - 2 * 24 * 60 * 60
+        os.utime(entry, (stale, stale))
+        _METADATA_MEMORY.clear()  # As in a new process
+
+        get_video_metadata(video_id)
+
+        assert page_request.call_count == 2
+
+    def test_corrupt_entry_refetched(self, page_request, video_id, cache_dir):
+        """Test that an unreadable cache entry is ignored"""
+        entry = cache_dir / "metadata" / f"{video_id}.json"
+        entry.parent.mkdir(parents=True)
+        entry.write_text("not json")
+
+        metadata = get_video_metadata(video_id)
+
+        assert metadata["title"] == "Rick Astley - Never Gonna Give You Up"
+        page_request.assert_called_once()
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_failed_lookup_not_cached(self, mock_request, video_id, cache_dir):
+        """Test that results without a title are not cached"""
+        mock_request.side_effect = URLError("Network unreachable")
+
+        get_video_metadata(video_id)
+        get_video_metadata(video_id)
+
+        assert mock_request.call_count == 2
+        assert not (cache_dir / "metadata").exists()
+
+    def test_clear_metadata_cache(self, page_request, video_id):
+        """Test that clearing the cache forces a new request"""
+        get_video_metadata(video_id)
+        clear_metadata_cache()
+        get_video_metadata(video_id)
+
+        assert page_request.call_count == 2
+
+    def test_empty_env_var_disables_cache(self, page_request, video_id, monkeypatch):
+        """Test that YT_THUMBS_CACHE='' turns metadata caching off"""
+        monkeypatch.setenv("YT_THUMBS_CACHE", "")
+
+        get_video_metadata(video_id)
+        get_video_metadata(video_id)
+        clear_metadata_cache()
+
+        assert page_request.call_count == 2
+
+
+class TestMetadataMemoryCache:
+    """Test the in-process metadata cache in front of the disk cache."""
+
+    def test_memory_hit_skips_disk(self, page_request, video_id, cache_dir):
+        """Test that a repeat lookup is answered without reading the disk entry"""
+        first = get_video_metadata(video_id)
+        (cache_dir / "metadata" / f"{video_id}.json").unlink()
+
+        assert get_video_metadata(video_id) == first
+        page_request.assert_called_once()
+
+    def test_disk_hit_fills_memory(self, page_request, video_id, cache_dir):
+        """Test that entries read from disk are kept in memory afterwards"""
+        get_video_metadata(video_id)
+        _METADATA_MEMORY.clear()
+        get_video_metadata(video_id)
+        (cache_dir / "metadata" / f"{video_id}.json").unlink()
+
+        get_video_metadata(video_id)
+
+        page_request.assert_called_once()
+
+    def test_memory_copy_expires_with_disk_entry(self, page_request, video_id, cache_dir):
+        """Test that an entry read from disk is not kept past its one-day TTL"""
+        get_video_metadata(video_id)
+        _METADATA_MEMORY.clear()
+        # A minute short of a day old
+        almost_stale = time.time() - (24 * 60 * 60 - 60)
+        os.utime(cache_dir / "metadata" / f"{video_id}.json", (almost_stale, almost_stale))
+
+        with patch("time.monotonic", return_value=1000):
+            get_video_metadata(video_id)
+        with patch("time.monotonic", return_value=1061):
+            assert _METADATA_MEMORY.get((video_id, False)) is None
+
+    def test_returns_copies(self, page_request, video_id):
+        """Test that callers modifying a result don't change the cached entry"""
+        get_video_metadata(video_id)["title"] = "changed"
+
+        assert get_video_metadata(video_id)["title"] == "Rick Astley - Never Gonna Give You Up"
+
+    def test_least_recently_used_evicted(self):
+        """Test that the least recently used entry is dropped when full"""
+        cache = _MemoryCache(maxsize=2, ttl=60)
+        cache.put(("a", False), {"title": "a"})
+        cache.put(("b", False), {"title": "b"})
+        cache.get(("a", False))
+        cache.put(("c", False), {"title": "c"})
+
+        assert cache.get(("b", False)) is None
+        assert cache.get(("a", False)) == {"title": "a"}
+        assert cache.get(("c", False)) == {"title": "c"}
+
+    def test_entries_expire(self):
+        """Test that entries are dropped once their ttl has passed"""
+        cache = _MemoryCache(maxsize=2, ttl=60)
+        with patch("time.monotonic", return_value=1000):
+            cache.put(("a", False), {"title": "a"})
+        with patch("time.monotonic", return_value=1061):
+            assert cache.get(("a", False)) is None
+
+
+class TestFastMetadata:
+    """Test title-only metadata lookups via oEmbed."""
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_title_from_oembed(self, mock_request, video_id):
+        """Test that fast mode reads the title from the oEmbed JSON"""
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.read.return_value = b'{"title": "Never Gonna Give You Up", "type": "video"}'
+        mock_request.return_value = mock_response
+
+        metadata = get_video_metadata(video_id, fast=True)
+
+        assert metadata == {
+            "title": "Never Gonna Give You Up",
+            "description": "",
+            "thumbnail_url": f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg",
+        }
+        method, url = mock_request.call_args[0][:2]
+        assert method == "GET"
+        assert url.startswith("https://www.youtube.com/oembed?url=https%3A%2F%2Fyoutu.be%2F")
+        assert url.endswith("&format=json")
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_oembed_error_returns_empty_metadata(self, mock_request, video_id):
+        """Test that oEmbed failures (e.g. private videos) return an empty title"""
+        mock_request.side_effect = HTTPError("", 401, "Unauthorized", {}, None)
+
+        metadata = get_video_metadata(video_id, fast=True)
+
+        assert metadata["title"] == ""
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_invalid_json_returns_empty_metadata(self, mock_request, video_id):
+        """Test that a malformed oEmbed response returns an empty title"""
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.read.return_value = b"<html>not json</html>"
+        mock_request.return_value = mock_response
+
+        assert get_video_metadata(video_id, fast=True)["title"] == ""
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_fast_result_not_used_for_full_lookup(self, mock_request, video_id, mock_video_html):
+        """Test that a cached fast result doesn't stand in for a full lookup"""
+        oembed = MagicMock()
+        oembed.__enter__.return_value = oembed
+        oembed.read.return_value = b'{"title": "Never Gonna Give You Up"}'
+        page = MagicMock()
+        page.__enter__.return_value = page
+        page.read.return_value = mock_video_html.encode("utf-8")
+        mock_request.side_effect = [oembed, page]
+
+        get_video_metadata(video_id, fast=True)
+        metadata = get_video_metadata(video_id)
+
+        assert metadata["description"] == (
+            "The official video for Rick Astley's Never Gonna Give You Up"
+        )
+
+    @patch("yt_thumbs.extractor._POOL.request")
+    def test_full_result_answers_fast_lookup(self, mock_request, video_id, mock_video_html):
+        """Test that a cached full result is reused by fast lookups"""
+        page = MagicMock()
+        page.__enter__.return_value = page
+        page.read.return_value = mock_video_html.encode("utf-8")
+        mock_request.return_value = page
+
+        full = get_video_metadata(video_id)
+        fast = get_video_metadata(video_id, fast=True)
+
+        assert fast == full
+        mock_request.assert_called_once()
+
+
+class TestSharedFetches:
+    """Test that simultaneous requests for one video share a fetch."""
+
+    @pytest.fixture
+    def waiters(self):
+        """Semaphore released each time a caller starts waiting on a shared call
+
+        Lets the running call hold off until every other caller has joined
+        it, instead of guessing how long they take to arrive.
+        """
+        waiting = threading.Semaphore(0)
+
+        class WaitedFuture(Future):
+            def result(self, timeout=None):
+                waiting.release()
+                return super().result(timeout)
+
+        with patch("yt_thumbs.extractor.Future", WaitedFuture):
+            yield waiting
+
+    @staticmethod
+    def _wait_for(waiters, count):
+        """Block until count callers are waiting on the running call"""
+        for _ in range(count):
+            assert waiters.acquire(timeout=5)
+
+    @staticmethod
+    def _run_concurrently(target, count):
+        """Run target(i) in count threads at once and return the results"""
+        results = [None] * count
+        threads = [
+            threading.Thread(target=lambda i=i: results.__setitem__(i, target(i)))
+            for i in range(count)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        return results
+
+    def test_metadata_fetched_once(self, video_id, monkeypatch, waiters):
+        """Test that concurrent lookups of one video make a single request"""
+        monkeypatch.setenv("YT_THUMBS_CACHE", "")  # Late callers must not hit a cache
+
+        def fetch(video_id):
+            self._wait_for(waiters, 3)
+            return {"title": "Test", "description": "", "thumbnail_url": ""}
+
+        with patch("yt_thumbs.extractor._fetch_video_metadata", side_effect=fetch) as mock_fetch:
+            results = self._run_concurrently(lambda i: get_video_metadata(video_id), 4)
+
+        mock_fetch.assert_called_once()
+        assert all(result == results[0] for result in results)
+        assert len({id(result) for result in results}) == 4  # Separate copies
+
+    def test_thumbnail_downloaded_once(self, video_id, temp_dir, waiters):
+        """Test that concurrent downloads of one video fetch it once and all get the file"""
+
+        def fetch(video_id, output_path, parallel_probes):
+            self._wait_for(waiters, 2)
+            with open(output_path, "wb") as f:
+                f.write(b"image data")
+            return True
+
+        with patch("yt_thumbs.extractor._fetch_thumbnail", side_effect=fetch) as mock_fetch:
+            results = self._run_concurrently(
+                lambda i: download_thumbnail(video_id, str(temp_dir / f"{i}.jpg")), 3
+            )
+
+        mock_fetch.assert_called_once()
+        assert results == [True, True, True]
+        assert all((temp_dir / f"{i}.jpg").read_bytes() == b"image data" for i in range(3))
+
+    def test_output_error_not_shared(self, video_id, temp_dir, waiters):
+        """Test that a caller whose own output can't be written fails alone"""
+        (temp_dir / "0.jpg").mkdir()  # The first caller's output path is taken
+        started = threading.Event()
+
+        def fetch(video_id, output_path, parallel_probes):
+            started.set()
+            self._wait_for(waiters, 1)
+            with open(output_path, "wb") as f:
+                f.write(b"image data")
+            return True
+
+        errors = []
+
+        def download(i):
+            try:
+                return download_thumbnail(video_id, str(temp_dir / f"{i}.jpg"))
+            except OSError as e:
+                errors.append(e)
+                return None
+
+        with patch("yt_thumbs.extractor._fetch_thumbnail", side_effect=fetch) as mock_fetch:
+            leader = threading.Thread(target=download, args=(0,))
+            leader.start()
+            started.wait(timeout=5)
+            result = download(1)
+            leader.join(timeout=5)
+
+        mock_fetch.assert_called_once()
+        assert len(errors) == 1
+        assert result is True
+        assert (temp_dir / "1.jpg").read_bytes() == b"image data"
+
+    def test_failed_thumbnail_shared(self, video_id, temp_dir, waiters):
+        """Test that waiting callers see the failure without retrying it"""
+
+        def fetch(video_id, output_path, parallel_probes):
+            self._wait_for(waiters, 2)
+            return False
+
+        with patch("yt_thumbs.extractor._fetch_thumbnail", side_effect=fetch) as mock_fetch:
+            results = self._run_concurrently(
+                lambda i: download_thumbnail(video_id, str(temp_dir / f"{i}.jpg")), 3
+            )
+
+        mock_fetch.assert_called_once()
+        assert results == [False, False, False]
+
+    def test_exception_shared_with_waiters(self, waiters):
+        """Test that an exception from the running call reaches every waiter"""
+        calls = _SharedCalls()
+        started = threading.Event()
+
+        def fail():
+            started.set()
+            self._wait_for(waiters, 1)
+            raise OSError("disk full")
+
+        errors = []
+
+        def call():
+            try:
+                calls.run("key", fail)
+            except OSError as e:
+                errors.append(e)
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait(timeout=5)
+        follower = threading.Thread(target=call)
+        follower.start()
+        leader.join(timeout=5)
+        follower.join(timeout=5)
+
+        assert len(errors) == 2
+
+    def test_finished_calls_not_reused(self):
+        """Test that a call made after another finished runs again"""
+        calls = _SharedCalls()
+
+        assert calls.run("key", lambda: 1) == 1
+        assert calls.run("key", lambda: 2) == 2
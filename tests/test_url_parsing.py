@@ -6,7 +6,7 @@ Tests all supported URL formats, edge cases, and invalid inputs.
 
 import pytest
 
-from yt_thumbs.extractor import extract_video_id
+from yt_thumbs.extractor import extract_video_id, extract_video_ids
 
 
 class TestValidYouTubeURLs:
@@ -22,7 +22,6 @@ class TestValidYouTubeURLs:
         video_id = extract_video_id(valid_short_url)
         assert video_id == "dQw4w9WgXcQ"
 
-    @pytest.mark.skip(reason="Shorts URLs not yet supported by extractor")
     def test_shorts_url(self, valid_shorts_url):
         """Test YouTube Shorts URL: youtube.com/shorts/ID"""
         video_id = extract_video_id(valid_shorts_url)
@@ -91,6 +90,12 @@ class TestURLsWithQueryParameters:
         video_id = extract_video_id(url)
         assert video_id == "dQw4w9WgXcQ"
 
+    def test_video_param_not_first(self):
+        """Test URL where v is not the first query parameter"""
+        url = "https://www.youtube.com/watch?feature=share&v=dQw4w9WgXcQ"
+        video_id = extract_video_id(url)
+        assert video_id == "dQw4w9WgXcQ"
+
 
 class TestInvalidURLs:
     """Test handling of invalid URLs."""
@@ -176,7 +181,6 @@ class TestEdgeCases:
         video_id = extract_video_id(url)
         assert video_id == "test-video1"
 
-    @pytest.mark.skip(reason="Shorts URLs not yet supported by extractor")
     def test_shorts_url_with_query_params(self):
         """Test Shorts URL with additional parameters"""
         url = "https://www.youtube.com/shorts/dQw4w9WgXcQ?feature=share"
@@ -207,18 +211,24 @@ class TestEdgeCases:
         video_id = extract_video_id(url)
         assert video_id == "dQw4w9WgXcQ"
 
+    def test_url_with_port(self):
+        """Test that an explicit port doesn't affect parsing"""
+        url = "https://www.youtube.com:443/watch?v=dQw4w9WgXcQ"
+        video_id = extract_video_id(url)
+        assert video_id == "dQw4w9WgXcQ"
+
 
 class TestBatchURLProcessing:
     """Test processing multiple URLs."""
 
     def test_multiple_different_formats(self):
         """Test extracting video IDs from multiple URL formats"""
-        # Only test supported formats (watch and short URLs, not Shorts)
         urls = [
             "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
             "https://youtu.be/jNQXAC9IVRw",
+            "https://www.youtube.com/shorts/abc123defgh",
         ]
-        expected_ids = ["dQw4w9WgXcQ", "jNQXAC9IVRw"]
+        expected_ids = ["dQw4w9WgXcQ", "jNQXAC9IVRw", "abc123defgh"]
 
         for url, expected_id in zip(urls, expected_ids):
             video_id = extract_video_id(url)
@@ -229,3 +239,21 @@ class TestBatchURLProcessing:
         for url in invalid_urls:
             video_id = extract_video_id(url)
             assert video_id is None
+
+    def test_extract_video_ids_matches_single_extraction(self, invalid_urls):
+        """Test that batch extraction yields one result per URL, in order"""
+        urls = [
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            *invalid_urls,
+            "https://youtu.be/jNQXAC9IVRw",
+        ]
+
+        assert list(extract_video_ids(urls)) == [extract_video_id(url) for url in urls]
+
+    def test_extract_video_ids_is_lazy(self):
+        """Test that URLs are consumed one at a time, so large inputs can stream"""
+        urls = iter(["https://youtu.be/dQw4w9WgXcQ", "https://youtu.be/jNQXAC9IVRw"])
+        video_ids = extract_video_ids(urls)
+
+        assert next(video_ids) == "dQw4w9WgXcQ"
+        assert next(urls) == "https://youtu.be/jNQXAC9IVRw"